@@ -0,0 +1,243 @@
+"""Benchmarks for the game's hot paths on synthetic levels, compared against a stored baseline."""
+
+import argparse
+import gc
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import warnings
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import tcod
+
+import roguelike as rl
+from roguelike.support import variables as var
+
+MAP_SIZES = ((80, 43), (250, 250), (500, 500), (1000, 1000))
+ENTITY_COUNTS = (10, 100, 1000, 10000)
+QUICK_MAP_SIZES = ((80, 43), (250, 250))
+QUICK_ENTITY_COUNTS = (10, 100, 1000)
+
+PILLAR_DENSITY = 0.1  # share of the floor turned into walls
+BLOCKED_LOOKUPS = 10000
+
+SEED = 1234
+
+
+def build_level(width: int, height: int, entities: int) -> None:
+    """Replace the current game with a synthetic level of the given size, with orcs on it."""
+    rl.constants.MAP_WIDTH, rl.constants.MAP_HEIGHT = width, height
+    rl.engine.new_game(SEED)
+    rng = np.random.default_rng(SEED)
+
+    game_map = rl.GameMap(width, height)
+    game_map.carve(1, 1, width - 2, height - 2)
+    pillars = rng.random((width, height)) < PILLAR_DENSITY
+    pillars[width // 2, height // 2] = False
+    game_map.blocked[...] = np.asarray(game_map.blocked) | pillars
+    game_map.block_sight[...] = np.asarray(game_map.block_sight) | pillars
+
+    # the player can't die, so the monsters keep attacking on every run
+    var.player.fighter.base_max_hp = var.player.fighter.hp = 10**9
+    free = np.flatnonzero(~np.asarray(game_map.blocked))
+    free = free[free != np.ravel_multi_index((width // 2, height // 2), (width, height))]
+    tiles = rng.choice(free, entities + 1, replace=False)
+    xs, ys = np.unravel_index(tiles, (width, height))
+
+    var.game_map = game_map
+    var.game_objects = rl.ObjectStore([var.player])
+    var.game_objects.relocate(var.player, width // 2, height // 2)
+    for x, y in zip(xs[:-1].tolist(), ys[:-1].tolist()):
+        fighter = rl.Fighter(hp=20, defense=0, power=4, xp=35, death_function=rl.deaths.monster_death)
+        monster = rl.Object(
+            x, y, rl.constants.ORC_TILE, "orc", rl.Colors.DESATURATED_GREEN, blocks=True, fighter=fighter, ai=rl.BasicMonster()
+        )
+        var.game_objects.append(monster)
+    var.stairs = rl.Object(int(xs[-1]), int(ys[-1]), rl.constants.STAIRSDOWN_TILE, "stairs", rl.Colors.WHITE)
+    var.game_objects.insert(0, var.stairs)
+    var.upstairs = None
+    var.scheduler = rl.scheduler.Scheduler()
+
+    var.CON = tcod.console.Console(rl.constants.VIEW_WIDTH, rl.constants.VIEW_HEIGHT, order="F")
+    var.panel = tcod.console.Console(rl.constants.SCREEN_WIDTH, rl.constants.PANEL_HEIGHT)
+    rl.common.initialize_fov()
+
+
+def fits(width: int, height: int, entities: int) -> bool:
+    """Return True if the entities fit comfortably on the map (a quarter of its tiles at most)."""
+    return entities <= width * height // 4
+
+
+def timed(function: Callable[[], object]) -> float:
+    """Return how long a call takes, in seconds."""
+    gc.collect()
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def bench_generate_level(width: int, height: int, placement: str = "random") -> float:
+    """Dungeon generation (rooms, tunnels and place_objects) at the given map size, with a room placement."""
+    rl.constants.MAP_WIDTH, rl.constants.MAP_HEIGHT = width, height
+    rl.constants.ROOM_PLACEMENT = placement
+    try:
+        return timed(lambda: rl.dungeon.generate_level(SEED, 5))
+    finally:
+        rl.constants.ROOM_PLACEMENT = "random"
+
+
+def bench_initialize_fov(width: int, height: int) -> float:
+    """Building the FOV map and computing the first FOV."""
+    build_level(width, height, 10)
+    return timed(rl.common.initialize_fov)
+
+
+def bench_render_all(width: int, height: int, entities: int) -> float:
+    """A full frame after the player moved: FOV recompute, tiles, objects and panel, to offscreen consoles."""
+    build_level(width, height, entities)
+    var.fov_recompute = True
+    return timed(rl.render.render_all)
+
+
+def bench_render_idle(width: int, height: int, entities: int) -> float:
+    """A frame where nothing changed since the last one, which should draw nothing."""
+    build_level(width, height, entities)
+    rl.render.render_all()
+    return timed(rl.render.render_all)
+
+
+def bench_is_blocked(width: int, height: int, entities: int) -> float:
+    """BLOCKED_LOOKUPS is_blocked calls on random tiles."""
+    build_level(width, height, entities)
+    rng = np.random.default_rng(SEED)
+    tiles = list(zip(rng.integers(0, width, BLOCKED_LOOKUPS).tolist(), rng.integers(0, height, BLOCKED_LOOKUPS).tolist()))
+    is_blocked = rl.common.is_blocked
+    return timed(lambda: [is_blocked(x, y) for x, y in tiles])
+
+
+def bench_ai_sweep(width: int, height: int, entities: int) -> float:
+    """One monster turn: the monsters in view wake up, and the awake ones (not the whole level) take their turns."""
+    build_level(width, height, entities)
+    return timed(rl.engine.monsters_take_turn)
+
+
+def bench_fighter_attack(entities: int) -> float:
+    """The player attacks each monster once (damage and combat messages, no deaths)."""
+    build_level(250, 250, entities)
+    targets = [obj for obj in var.game_objects if obj.ai]
+    for target in targets:
+        target.fighter.hp = 10**9
+    attack = var.player.fighter.attack
+    return timed(lambda: [attack(target) for target in targets])
+
+
+def bench_save_load(width: int, height: int, entities: int) -> float:
+    """Encoding the game to save file contents and restoring it again, in memory."""
+    build_level(width, height, entities)
+    savefile = rl.savefile
+    return timed(lambda: savefile.restore(savefile.decode(savefile.encode(savefile.snapshot()))))
+
+
+def cases(sizes: tuple, counts: tuple) -> list[tuple[str, Callable[..., float], dict[str, Any]]]:
+    """Return every benchmark with every set of parameters it runs with."""
+    by_size = [{"width": w, "height": h} for w, h in sizes]
+    by_size_and_count = [
+        {"width": w, "height": h, "entities": n} for (w, h), n in itertools.product(sizes, counts) if fits(w, h, n)
+    ]
+    return [
+        *(("generate_level", bench_generate_level, params) for params in by_size),
+        *(("generate_level", bench_generate_level, {**params, "placement": "bsp"}) for params in by_size),
+        *(("initialize_fov", bench_initialize_fov, params) for params in by_size),
+        *(("render_all", bench_render_all, params) for params in by_size_and_count),
+        *(("render_idle", bench_render_idle, params) for params in by_size_and_count),
+        *(("is_blocked", bench_is_blocked, params) for params in by_size_and_count),
+        *(("ai_sweep", bench_ai_sweep, params) for params in by_size_and_count),
+        *(("fighter_attack", bench_fighter_attack, {"entities": n}) for n in counts),
+        *(("save_load", bench_save_load, params) for params in by_size_and_count),
+    ]
+
+
+def case_key(result: dict) -> str:
+    """Return the name a result is matched by, e.g. ``render_all[width=80,height=43,entities=10]``."""
+    params = ",".join(f"{name}={value}" for name, value in result["params"].items())
+    return f"{result['name']}[{params}]"
+
+
+def run(selected: list, repeats: int) -> list[dict]:
+    """Run the benchmarks, printing each result as it comes, and return the results."""
+    results = []
+    for name, bench, params in selected:
+        times = [bench(**params) for _ in range(repeats)]
+        result = {
+            "name": name,
+            "params": params,
+            "repeats": repeats,
+            "min": min(times),
+            "median": statistics.median(times),
+            "mean": statistics.fmean(times),
+        }
+        results.append(result)
+        print(f"{case_key(result):<55} median {result['median'] * 1000:10.3f} ms   min {result['min'] * 1000:10.3f} ms")
+    return results
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> bool:
+    """Print how the results compare to a baseline run, returning False if anything got slower than the threshold."""
+    before = {case_key(result): result for result in baseline["results"]}
+    ok = True
+    print(f"\nCompared to the baseline (threshold {threshold:.0%}):")
+    for result in results:
+        key = case_key(result)
+        if key not in before:
+            print(f"{key:<55} new")
+            continue
+        ratio = result["median"] / before[key]["median"]
+        if ratio > 1 + threshold:
+            verdict = "SLOWER"
+            ok = False
+        elif ratio < 1 / (1 + threshold):
+            verdict = "faster"
+        else:
+            verdict = ""
+        print(f"{key:<55} {ratio:6.2f}x {verdict}")
+    return ok
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths.")
+    parser.add_argument("--quick", action="store_true", help="only the smaller map sizes and entity counts")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per benchmark (the median is compared)")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare the results to this earlier JSON output")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown that counts as a regression (0.25 = 25%%)")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", FutureWarning)  # tcod's deprecated console defaults, used by the game
+
+    sizes, counts = (QUICK_MAP_SIZES, QUICK_ENTITY_COUNTS) if args.quick else (MAP_SIZES, ENTITY_COUNTS)
+    selected = [case for case in cases(sizes, counts) if args.filter in case[0]]
+    results = run(selected, args.repeats)
+
+    if args.output:
+        document = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "tcod": tcod.__version__,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(document, indent=1))
+    if args.baseline and not compare(results, json.loads(args.baseline.read_text()), args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Memory benchmark: bytes per entity and per map tile, as traced by tracemalloc."""
+
+import argparse
+import gc
+import json
+import platform
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import roguelike as rl
+
+COUNT = 10000
+KINDS = ("orc", "troll", "healing potion", "scroll of lightning bolt", "sword", "shield")
+MAP_SIDE = 1000
+
+
+def allocated(build: Callable[[], object]) -> int:
+    """Return the bytes allocated by a function for what it returns (kept alive until measured)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def spawn_all(kind: str) -> list:
+    """Return COUNT objects of a kind, on different tiles."""
+    template = rl.content.template(kind)
+    return [template.spawn(i % MAP_SIDE, i // MAP_SIDE) for i in range(COUNT)]
+
+
+def carved_map() -> rl.GameMap:
+    """Return a map with every plane written all over, as chunks are only allocated where a plane is written to."""
+    game_map = rl.GameMap(MAP_SIDE, MAP_SIDE)
+    game_map.carve(1, 1, MAP_SIDE - 2, MAP_SIDE - 2)
+    game_map.explored[...] = True
+    return game_map
+
+
+def measure() -> list[dict]:
+    """Run all measurements, printing each result as it comes, and return the results."""
+    cases: list[tuple[str, Callable[[], object], int]] = [
+        (f"entity[{kind}]", lambda kind=kind: spawn_all(kind), COUNT) for kind in KINDS
+    ]
+
+    orcs = spawn_all("orc")
+    cases += [
+        ("entity[store]", lambda: rl.ObjectStore(orcs), COUNT),
+        ("tile[Tile]", lambda: [rl.Tile(blocked=i % 2 == 0) for i in range(COUNT)], COUNT),
+        ("tile[GameMap]", carved_map, MAP_SIDE * MAP_SIDE),
+        ("room[Rect]", lambda: [rl.Rect(i, i, 8, 6) for i in range(COUNT)], COUNT),
+    ]
+
+    results = []
+    for name, build, count in cases:
+        per_item = allocated(build) / count
+        results.append({"name": name, "bytes": per_item})
+        print(f"{name:<34} {per_item:10.1f} bytes each")
+    return results
+
+
+def main() -> None:
+    """Run the memory benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Measure the memory used per entity and per map tile.")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = measure()
+    if args.output:
+        document = {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+        args.output.write_text(json.dumps(document, indent=1))
+
+
+if __name__ == "__main__":
+    main()
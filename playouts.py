@@ -0,0 +1,56 @@
+"""Play many headless games with a bot across all cores, and report how they went."""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import roguelike as rl
+
+
+def parse_override(text: str) -> tuple[str, object]:
+    """Parse a NAME=VALUE constant override; the value is read as JSON (so 60, 1.5 and [1, 2] work)."""
+    name, _, value = text.partition("=")
+    return name, json.loads(value)
+
+
+def main() -> None:
+    """Run the playouts given on the command line."""
+    parser = argparse.ArgumentParser(description="Play many headless games with a bot and report the results.")
+    parser.add_argument("games", type=int, nargs="?", default=1000, help="number of games to play")
+    parser.add_argument("--policy", default="stairs", help="bot policy: random, stairs, or module:Class")
+    parser.add_argument("--max-turns", type=int, default=5000, help="turns after which a game is stopped")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (the others follow)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument(
+        "--set", type=parse_override, action="append", default=[], metavar="NAME=VALUE", help="override a constant"
+    )
+    parser.add_argument("--content", help="content file to use for the monsters, items and spawn tables")
+    parser.add_argument("--output", type=Path, help="write the report and every game's statistics to this JSON file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    settings = rl.playout.Settings(args.policy, args.max_turns, dict(args.set), args.content)
+    try:
+        results = rl.playout.run_playouts(args.games, settings, args.seed, args.workers)
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start
+    report = rl.playout.summarize(results)
+
+    print(f"{report['games']} games in {elapsed:.1f}s, {report['died']} died")
+    for name in ("depth", "turns", "damage_taken", "level"):
+        spread = report[name]
+        print(
+            f"{name:<13} mean {spread['mean']:8.1f}  median {spread['median']:7.1f}  "
+            f"p10 {spread['p10']:7.1f}  p90 {spread['p90']:7.1f}  max {spread['max']:7.1f}"
+        )
+    print("depth reached", ", ".join(f"{depth}: {count}" for depth, count in report["depth_reached"].items()))
+    print("items used per game", ", ".join(f"{name}: {count:.2f}" for name, count in report["items_used_per_game"].items()))
+
+    if args.output:
+        args.output.write_text(json.dumps({"report": report, "games": results}, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Replay a recorded game headless, checking it plays out the same, and report how fast it ran."""
+
+import argparse
+import time
+
+import roguelike as rl
+
+
+def main() -> None:
+    """Replay the recording given on the command line."""
+    parser = argparse.ArgumentParser(description="Replay a recorded game headless.")
+    parser.add_argument("recording", nargs="?", default=rl.constants.RECORDING_FILE, help="recording file to replay")
+    parser.add_argument("--no-verify", action="store_true", help="skip the per-turn state checksums")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    turns = rl.replay.replay(rl.replay.load_recording(args.recording), verify=not args.no_verify)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {turns} turns in {elapsed:.3f}s ({turns / elapsed if elapsed else 0:.0f} turns/s)")
+
+
+if __name__ == "__main__":
+    main()
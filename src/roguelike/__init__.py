@@ -2,12 +2,41 @@
 
 # ruff: noqa: F401
 from .classes.basic_monster import BasicMonster
+from .classes.camera import Camera
+from .classes.chunked_plane import ChunkedPlane
 from .classes.confused_monster import ConfusedMonster
 from .classes.equipment import Equipment
 from .classes.fighter import Fighter
+from .classes.frame_cache import FrameCache
+from .classes.game_map import GameMap
 from .classes.item import Item
+from .classes.level_store import Level, LevelStore
+from .classes.message_log import Message, MessageLog
 from .classes.object import Object
+from .classes.object_store import ObjectStore
 from .classes.rect import Rect
+from .classes.spawn_table import SpawnTable
+from .classes.template import Template
 from .classes.tile import Tile
-from .support import common, constants, variables
+from .support import (
+    autosave,
+    common,
+    constants,
+    content,
+    deaths,
+    dungeon,
+    engine,
+    playout,
+    pregenerate,
+    profiler,
+    registry,
+    render,
+    replay,
+    rng,
+    savefile,
+    scheduler,
+    spells,
+    variables,
+)
 from .support.colors import Colors
+from .support.interface import Interface
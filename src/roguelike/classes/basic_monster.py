@@ -1,21 +1,36 @@
 """Class for basic monster."""
 
-from tcod import libtcodpy
+from typing import Any
 
 from ..support import variables as var
+from ..support.pathfinding import flow_field, is_reachable
 
 
 class BasicMonster:
     """AI for a basic monster."""
 
+    __slots__ = ("owner",)
+
+    def __init__(self):
+        """Initialize class."""
+        self.owner: Any = None  # the object it belongs to
+
     def take_turn(self) -> None:
         """A basic monster takes its turn. If you can see it, it can see you."""
         monster = self.owner
-        if libtcodpy.map_is_in_fov(var.fov_map, monster.x, monster.y):
+        if var.visible[monster.x, monster.y]:
             # move towards player if far away
             if monster.distance_to(var.player) >= 2:
-                monster.move_towards(var.player.x, var.player.y)
+                distance = flow_field()
+                if is_reachable(distance, monster.x, monster.y):
+                    monster.move_downhill(distance)
+                else:
+                    monster.move_towards(var.player.x, var.player.y)
 
             # close enough, attack! (if the player is still alive.)
             elif var.player.fighter.hp > 0:
                 monster.fighter.attack(var.player)
+
+    def active(self) -> bool:
+        """Return True if the monster should keep getting turns: only while it sees the player."""
+        return bool(var.visible[self.owner.x, self.owner.y])
@@ -0,0 +1,36 @@
+"""Camera class."""
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Camera:
+    """The part of the map shown on screen: a fixed-size view that follows the player."""
+
+    width: int
+    height: int
+    x: int = 0  # map coordinates of the view's top left tile
+    y: int = 0
+
+    def follow(self, x: int, y: int, map_width: int, map_height: int) -> None:
+        """Center the view on the given coordinates, without going past the edges of the map."""
+        self.x = min(max(x - self.width // 2, 0), max(map_width - self.width, 0))
+        self.y = min(max(y - self.height // 2, 0), max(map_height - self.height, 0))
+
+    def bounds(self, map_width: int, map_height: int) -> tuple[int, int, int, int]:
+        """Return the map area in view as (x1, y1, x2, y2), the second corner exclusive."""
+        return (self.x, self.y, min(self.x + self.width, map_width), min(self.y + self.height, map_height))
+
+    def contains(self, x: int, y: int) -> bool:
+        """Return True if the map coordinates are in view."""
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    def to_screen(self, x: int, y: int) -> tuple[int, int]:
+        """Return the screen coordinates of map coordinates."""
+        return (x - self.x, y - self.y)
+
+    def to_map(self, x: int, y: int) -> tuple[int | None, int | None]:
+        """Return the map coordinates of screen coordinates, or (None, None) if they're outside the view."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return (None, None)
+        return (x + self.x, y + self.y)
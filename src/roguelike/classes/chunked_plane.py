@@ -0,0 +1,139 @@
+"""Chunked plane class."""
+
+from typing import Any
+
+import numpy as np
+
+from ..support import constants as const
+
+
+class ChunkedPlane:
+    """A 2D array indexed ``[x, y]``, stored in square chunks that are only allocated once written to."""
+
+    def __init__(self, width: int, height: int, dtype: Any = bool, fill: Any = False, chunk_size: int = const.MAP_CHUNK_SIZE):
+        """Initialize a plane where every tile has the fill value."""
+        if chunk_size & (chunk_size - 1):
+            raise ValueError(f"The chunk size must be a power of two, not {chunk_size}")
+        self.width = width
+        self.height = height
+        self.dtype = np.dtype(dtype)
+        self.fill = self.dtype.type(fill)
+        self.chunk_size = chunk_size
+        self.shift = chunk_size.bit_length() - 1
+        self.mask = chunk_size - 1
+        self.table = np.zeros((-(-width // chunk_size), -(-height // chunk_size)), np.int32)  # chunk position -> pool index
+        self.pool = np.full((2, chunk_size, chunk_size), self.fill, self.dtype)  # chunk 0 stands for every unallocated one
+        self.allocated = 0  # chunks in use, not counting chunk 0
+        self.version = 0  # goes up on every write, so views can tell they're out of date
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Return the size of the plane, like an array's shape."""
+        return (self.width, self.height)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by the allocated chunks and the table."""
+        return (self.allocated + 1) * self.pool[0].nbytes + self.table.nbytes
+
+    def __array__(self, dtype: Any = None, copy: bool | None = None) -> np.ndarray:
+        """Return the whole plane as a dense array."""
+        dense = self._read(0, 0, self.width, self.height)
+        return dense if dtype is None else dense.astype(dtype, copy=False)
+
+    def __getitem__(self, key: Any) -> Any:
+        """Return a tile, a rectangle of slices, the tiles at arrays of coordinates, or everything for ``...``."""
+        if key is Ellipsis:
+            return self._read(0, 0, self.width, self.height)
+        x, y = key
+        if type(x) is int and type(y) is int and 0 <= x < self.width and 0 <= y < self.height:
+            # one tile, the most common case
+            return self.pool[self.table[x >> self.shift, y >> self.shift], x & self.mask, y & self.mask]
+        if isinstance(x, slice) and isinstance(y, slice):
+            x1, x2, _ = x.indices(self.width)
+            y1, y2, _ = y.indices(self.height)
+            return self._read(x1, y1, x2, y2)
+        if isinstance(x, np.ndarray) or isinstance(y, np.ndarray):
+            xs = np.asarray(x)
+            ys = np.asarray(y)
+            return self.pool[self.table[xs >> self.shift, ys >> self.shift], xs & self.mask, ys & self.mask]
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"({x}, {y}) is outside the {self.width}x{self.height} plane")
+        return self.pool[self.table[x >> self.shift, y >> self.shift], x & self.mask, y & self.mask]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Set a tile, a rectangle of slices, or everything for ``...``, to a value or an array."""
+        if key is Ellipsis:
+            self._write(0, 0, self.width, self.height, value)
+            return
+        x, y = key
+        if isinstance(x, slice) and isinstance(y, slice):
+            x1, x2, _ = x.indices(self.width)
+            y1, y2, _ = y.indices(self.height)
+            self._write(x1, y1, x2, y2, value)
+            return
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"({x}, {y}) is outside the {self.width}x{self.height} plane")
+        self._write(x, y, x + 1, y + 1, value)
+
+    def clear(self) -> None:
+        """Set every tile back to the fill value, keeping the pool's memory for reuse."""
+        self.table[...] = 0
+        self.pool[1 : self.allocated + 1] = self.fill
+        self.allocated = 0
+        self.version += 1
+
+    def _read(self, x1: int, y1: int, x2: int, y2: int) -> np.ndarray:
+        """Return the rectangle from (x1, y1) up to (x2, y2), exclusive, as a dense array."""
+        if x2 <= x1 or y2 <= y1:
+            return np.full((max(x2 - x1, 0), max(y2 - y1, 0)), self.fill, self.dtype)
+        cx1, cy1 = x1 >> self.shift, y1 >> self.shift
+        cx2, cy2 = ((x2 - 1) >> self.shift) + 1, ((y2 - 1) >> self.shift) + 1
+
+        # gather the chunks covering the rectangle, lay them out as one array, then cut it to size
+        chunks = self.pool[self.table[cx1:cx2, cy1:cy2]]
+        size = self.chunk_size
+        dense = chunks.transpose(0, 2, 1, 3).reshape((cx2 - cx1) * size, (cy2 - cy1) * size)
+        left, top = cx1 << self.shift, cy1 << self.shift
+        return dense[x1 - left : x2 - left, y1 - top : y2 - top]
+
+    def _write(self, x1: int, y1: int, x2: int, y2: int, value: Any) -> None:
+        """Set the rectangle from (x1, y1) up to (x2, y2), exclusive, allocating the chunks that need it."""
+        if x2 <= x1 or y2 <= y1:
+            return
+        self.version += 1
+        value = np.asarray(value, self.dtype)
+        uniform = value.ndim == 0
+        if uniform and value == self.fill and not self.allocated:
+            return  # setting an empty plane to the fill value
+        cx, cy = x1 >> self.shift, y1 >> self.shift
+        index = self.table[cx, cy]
+        if index and (x2 - 1) >> self.shift == cx and (y2 - 1) >> self.shift == cy:
+            # inside one chunk that's already allocated, the most common case
+            left, top = cx << self.shift, cy << self.shift
+            self.pool[index, x1 - left : x2 - left, y1 - top : y2 - top] = value
+            return
+        size = self.chunk_size
+        for cx in range(x1 >> self.shift, ((x2 - 1) >> self.shift) + 1):
+            left = cx << self.shift
+            ax1, ax2 = max(x1, left), min(x2, left + size)
+            for cy in range(y1 >> self.shift, ((y2 - 1) >> self.shift) + 1):
+                top = cy << self.shift
+                ay1, ay2 = max(y1, top), min(y2, top + size)
+                part = value if uniform else value[ax1 - x1 : ax2 - x1, ay1 - y1 : ay2 - y1]
+                index = self.table[cx, cy]
+                if index == 0:
+                    if (part == self.fill).all():
+                        continue  # nothing to store
+                    index = self._allocate(cx, cy)
+                self.pool[index, ax1 - left : ax2 - left, ay1 - top : ay2 - top] = part
+
+    def _allocate(self, cx: int, cy: int) -> int:
+        """Give a chunk position its own chunk in the pool, growing the pool if it's full, and return its index."""
+        self.allocated += 1
+        if self.allocated == len(self.pool):
+            grown = np.full((2 * len(self.pool), self.chunk_size, self.chunk_size), self.fill, self.dtype)
+            grown[: len(self.pool)] = self.pool
+            self.pool = grown
+        self.table[cx, cy] = self.allocated
+        return self.allocated
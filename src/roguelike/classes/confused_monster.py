@@ -1,29 +1,36 @@
 """Confused monster class."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
-from tcod import libtcodpy
-
 from ..support import constants as const
+from ..support import variables as var
 from ..support.colors import Colors
 from ..support.common import message
+from ..support.rng import get_int
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfusedMonster:
     """AI for a temporarily confused monster (reverts to previous AI after a while)."""
 
     old_ai: Any
-    num_turns: int = const.CONFUSE_NUM_TURNS
+    num_turns: int = field(default_factory=lambda: const.CONFUSE_NUM_TURNS)
+    owner: Any = field(default=None, init=False, repr=False, compare=False)  # the object it belongs to
 
     def take_turn(self) -> None:
         """AI for a confused monster."""
+        var.game_objects.touch(self.owner)  # its turns left, or its AI, change either way
         if self.num_turns > 0:  # still confused...
             # move in a random direction, and decrease the number of turns confused
-            self.owner.move(libtcodpy.random_get_int(0, -1, 1), libtcodpy.random_get_int(0, -1, 1))
+            self.owner.move(get_int("ai", -1, 1), get_int("ai", -1, 1))
             self.num_turns -= 1
         # restore the previous AI (this one will be deleted because it's not referenced anymore)
         else:
+            self.old_ai.owner = self.owner  # a loaded game rebuilds the old AI without its owner
             self.owner.ai = self.old_ai
             message("The " + self.owner.name + " is no longer confused!", Colors.RED)
+
+    def active(self) -> bool:
+        """Return True: a confused monster keeps getting turns, in view or not, until the confusion wears off."""
+        return True
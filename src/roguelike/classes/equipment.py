@@ -1,13 +1,14 @@
 """Equipment class."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
+from ..support import variables as var
 from ..support.colors import Colors
 from ..support.common import get_equipped_in_slot, message
 
 
-@dataclass
+@dataclass(slots=True)
 class Equipment:
     """An object that can be equipped, yielding bonuses. Automatically adds the Item component."""
 
@@ -16,6 +17,7 @@ class Equipment:
     power_bonus: int = 0
     defense_bonus: int = 0
     max_hp_bonus: int = 0
+    owner: Any = field(default=None, init=False, repr=False, compare=False)  # the object it belongs to
 
     def toggle_equip(self) -> None:
         """Toggle equip/dequip status."""
@@ -33,6 +35,8 @@ class Equipment:
 
         # equip object and show a message about it
         self.is_equipped = True
+        var.equipped_slots[self.slot] = self
+        var.equipment_bonus = None  # the bonus totals changed
         message("Equipped " + self.owner.name + " on " + self.slot + ".", Colors.LIGHT_GREEN)
 
     def dequip(self) -> None:
@@ -40,4 +44,7 @@ class Equipment:
         if not self.is_equipped:
             return
         self.is_equipped = False
+        var.game_objects.touch(self.owner)  # a dropped item is dequipped once it's back on the map
+        var.equipped_slots.pop(self.slot, None)
+        var.equipment_bonus = None  # the bonus totals changed
         message("Dequipped " + self.owner.name + " from " + self.slot + ".", Colors.LIGHT_YELLOW)
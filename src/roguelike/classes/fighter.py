@@ -1,14 +1,18 @@
 """Fighter class."""
 
 from collections.abc import Callable
+from typing import Any
 
 from ..support import variables as var
-from ..support.common import get_all_equipped, message
+from ..support.common import get_equipment_bonus, message
+from ..support.scheduler import wake
 
 
 class Fighter:
     """combat-related properties and methods (monster, player, NPC)."""
 
+    __slots__ = ("base_max_hp", "hp", "base_defense", "base_power", "xp", "death_function", "owner")
+
     def __init__(self, hp: int, defense: int, power: int, xp: int, death_function: Callable | None = None):
         """Initialize class."""
         self.base_max_hp: int = hp
@@ -17,24 +21,28 @@ class Fighter:
         self.base_power: int = power
         self.xp: int = xp
         self.death_function: Callable | None = death_function
+        self.owner: Any = None  # the object it belongs to
+
+    def bonus(self, stat: str) -> int:
+        """Return the bonus to a stat from equipped items (only the player has equipment)."""
+        if self.owner is not var.player:
+            return 0
+        return get_equipment_bonus()[stat]
 
     @property
     def power(self) -> int:
-        """Return actual power, by summing up the bonuses from all equipped items."""
-        bonus = sum(equipment.power_bonus for equipment in get_all_equipped(self.owner))
-        return self.base_power + bonus
+        """Return actual power, adding the cached bonuses from all equipped items."""
+        return self.base_power + self.bonus("power")
 
     @property
     def defense(self) -> int:
-        """Return actual defense, by summing up the bonuses from all equipped items."""
-        bonus = sum(equipment.defense_bonus for equipment in get_all_equipped(self.owner))
-        return self.base_defense + bonus
+        """Return actual defense, adding the cached bonuses from all equipped items."""
+        return self.base_defense + self.bonus("defense")
 
     @property
     def max_hp(self) -> int:
-        """Return actual max_hp, by summing up the bonuses from all equipped items."""
-        bonus = sum(equipment.max_hp_bonus for equipment in get_all_equipped(self.owner))
-        return self.base_max_hp + bonus
+        """Return actual max_hp, adding the cached bonuses from all equipped items."""
+        return self.base_max_hp + self.bonus("max_hp")
 
     def attack(self, target) -> None:
         """A simple formula for attack damage."""
@@ -51,6 +59,9 @@ class Fighter:
         """Apply damage if possible."""
         if damage > 0:
             self.hp -= damage
+            var.game_objects.touch(self.owner)
+            if self.owner is not var.player:
+                wake(self.owner)  # being hurt gets a monster's attention
 
             # check for death. if there's a death function, call it
             if self.hp <= 0:
@@ -59,9 +70,11 @@ class Fighter:
                     function(self.owner)
                 if self.owner != var.player:  # yield experience to the player
                     var.player.fighter.xp += self.xp
+                    var.game_objects.touch(var.player)
 
     def heal(self, amount: int) -> None:
         """Heal by the given amount, without going over the maximum."""
         self.hp += amount
         if self.hp > self.max_hp:
             self.hp = self.max_hp
+        var.game_objects.touch(self.owner)
@@ -0,0 +1,49 @@
+"""Frame cache class."""
+
+from collections.abc import Hashable
+
+import numpy as np
+
+
+class FrameCache:
+    """The last frame drawn to each off-screen console, so that a new frame only touches the cells that changed."""
+
+    def __init__(self):
+        """Initialize class."""
+        self.keys: dict[str, Hashable] = {}  # what each console's contents depend on (camera, versions...)
+        self.frames: dict[str, np.ndarray] = {}  # the cells of each console as last drawn, indexed [x, y]
+        self.cells_touched = 0  # cells that changed in the last frame
+        self.total_cells = 0
+        self.frame_count = 0
+        self.idle_frames = 0  # frames where nothing had to be drawn
+
+    def start_frame(self) -> None:
+        """Start counting the cells touched by a new frame."""
+        self.frame_count += 1
+        self.cells_touched = 0
+
+    def end_frame(self) -> None:
+        """Finish the frame, counting it as idle if it didn't touch any cell."""
+        self.total_cells += self.cells_touched
+        if self.cells_touched == 0:
+            self.idle_frames += 1
+
+    def invalidate(self) -> None:
+        """Forget the last frames, so the next one is drawn and blitted in full."""
+        self.keys.clear()
+        self.frames.clear()
+
+    def stale(self, name: str, key: Hashable) -> bool:
+        """Return True if a console's contents depend on something that changed since the last frame, remembering the key."""
+        if name in self.keys and self.keys[name] == key:
+            return False
+        self.keys[name] = key
+        return True
+
+    def changes(self, name: str, frame: np.ndarray) -> np.ndarray:
+        """Return a mask of the cells of a console's new frame that differ from the last one, and keep the new frame."""
+        last = self.frames.get(name)
+        changed = np.ones(frame.shape, bool) if last is None or last.shape != frame.shape else frame != last
+        self.frames[name] = frame
+        self.cells_touched += int(np.count_nonzero(changed))
+        return changed
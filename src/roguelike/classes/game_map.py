@@ -0,0 +1,25 @@
+"""Game map class."""
+
+from .chunked_plane import ChunkedPlane
+
+
+class GameMap:
+    """The dungeon map, stored as boolean planes indexed ``[x, y]``, in chunks allocated as the map is carved."""
+
+    def __init__(self, width: int, height: int):
+        """Initialize a map where every tile is a wall."""
+        self.width: int = width
+        self.height: int = height
+        self.blocked = ChunkedPlane(width, height, bool, True)
+        self.block_sight = ChunkedPlane(width, height, bool, True)
+        self.explored = ChunkedPlane(width, height, bool, False)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """Return True if the coordinates are inside the map."""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def carve(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        """Make every tile in the inclusive rectangle (x1, y1)-(x2, y2) passable and transparent."""
+        area = (slice(min(x1, x2), max(x1, x2) + 1), slice(min(y1, y2), max(y1, y2) + 1))
+        self.blocked[area] = False
+        self.block_sight[area] = False
@@ -1,6 +1,6 @@
 """Item class."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 from ..support import variables as var
@@ -8,11 +8,12 @@ from ..support.colors import Colors
 from ..support.common import get_equipped_in_slot, message
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     """Class containing item objects."""
 
     use_function: Any = None
+    owner: Any = field(default=None, init=False, repr=False, compare=False)  # the object it belongs to
 
     def use(self) -> None:
         """Just call the "use_function" if it is defined.
@@ -35,10 +36,11 @@ class Item:
         max_inventory = 26
         if len(var.inventory) >= max_inventory:
             message("Your inventory is full, cannot pick up " + self.owner.name + ".", Colors.RED)
-        else:
-            var.inventory.append(self.owner)
-            var.game_objects.remove(self.owner)
-            message("You picked up a " + self.owner.name + "!", Colors.GREEN)
+            return
+
+        var.inventory.append(self.owner)
+        var.game_objects.remove(self.owner)
+        message("You picked up a " + self.owner.name + "!", Colors.GREEN)
 
         # special case: automatically equip, if the corresponding equipment slot is unused
         equipment = self.owner.equipment
@@ -47,10 +49,10 @@ class Item:
 
     def drop(self) -> None:
         """Add to the map and remove from the player's inventory. Also, place it at the player's coordinates."""
-        var.game_objects.append(self.owner)
         var.inventory.remove(self.owner)
         self.owner.x = var.player.x
         self.owner.y = var.player.y
+        var.game_objects.append(self.owner)
         message("You dropped a " + self.owner.name + ".", Colors.YELLOW)
 
         # special case: if the object has the Equipment component, dequip it before dropping
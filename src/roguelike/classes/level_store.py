@@ -0,0 +1,123 @@
+"""Level store class."""
+
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .game_map import GameMap
+
+
+@dataclass
+class Level:
+    """A dungeon level the player isn't on: its map and everything on it except the player."""
+
+    game_map: GameMap
+    objects: list[Any]
+    stairs: Any
+    upstairs: Any = None
+    start: tuple[int, int] = (0, 0)  # where the player arrives on a newly generated level
+
+
+class LevelStore:
+    """Levels the player has left, by depth: the latest in memory, older ones spilled to disk."""
+
+    def __init__(
+        self,
+        encode: Callable[[Level], bytes],
+        decode: Callable[[bytes], Level],
+        capacity: int,
+        directory: str | Path | None = None,
+    ):
+        """Initialize class. Without a directory, a temporary one is created for spilled levels."""
+        self.encode = encode
+        self.decode = decode
+        self.capacity = capacity
+        self.directory = Path(tempfile.mkdtemp(prefix="roguelike-levels-") if directory is None else directory)
+        self._memory: OrderedDict[int, Level] = OrderedDict()
+        self._encoded: dict[int, Future[bytes]] = {}  # encodings of the levels in memory
+        self._on_disk: set[int] = set()
+        self._io = ThreadPoolExecutor(1, thread_name_prefix="level-store")  # encoding and spill files, off the game thread
+        self._cleanup = None
+        if directory is None:
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self.directory, ignore_errors=True)
+
+    def __contains__(self, depth: int) -> bool:
+        """Return True if a level is stored for the given depth."""
+        return depth in self._memory or depth in self._on_disk
+
+    def depths(self) -> list[int]:
+        """Return the depths of all stored levels."""
+        return sorted([*self._memory, *self._on_disk])
+
+    def put(self, depth: int, level: Level) -> None:
+        """Store a level the player just left, spilling the least recently used ones to disk."""
+        self._forget(depth)
+        self._memory[depth] = level
+        self._encoded[depth] = self._io.submit(self.encode, level)
+        while len(self._memory) > self.capacity:
+            self._spill(next(iter(self._memory)))
+
+    def put_encoded(self, depth: int, data: bytes) -> None:
+        """Store an already encoded level (e.g. from a save file) straight to disk."""
+        self._forget(depth)
+        self._io.submit(self._write, depth, data)
+        self._on_disk.add(depth)
+
+    def take(self, depth: int) -> Level | None:
+        """Remove the level at the given depth from the store and return it, or None if there is none."""
+        if depth in self._memory:
+            level = self._memory.pop(depth)
+            self._encoded.pop(depth).result()  # the level is about to change, so it mustn't be encoded at the same time
+            return level
+        if depth in self._on_disk:
+            level = self.decode(self.encoded(depth).result())
+            self._forget(depth)
+            return level
+        return None
+
+    def encoded(self, depth: int) -> Future[bytes]:
+        """Return a future of the encoded level at the given depth, without taking it out of the store."""
+        if depth in self._on_disk:
+            return self._io.submit(self._path(depth).read_bytes)
+        return self._encoded[depth]
+
+    def close(self) -> None:
+        """Forget all levels and remove their spill files (and the directory, if it was a temporary one)."""
+        self._io.shutdown(wait=True)  # a save may still be waiting for encodings or spill files
+        for depth in self._on_disk:
+            self._path(depth).unlink(missing_ok=True)
+        self._on_disk.clear()
+        self._memory.clear()
+        self._encoded.clear()
+        if self._cleanup is not None:
+            self._cleanup()
+
+    def _spill(self, depth: int) -> None:
+        """Move a level from memory to disk."""
+        del self._memory[depth]
+        encoding = self._encoded.pop(depth)
+        self._io.submit(lambda: self._write(depth, encoding.result()))  # encoded by then, as jobs run in order
+        self._on_disk.add(depth)
+
+    def _write(self, depth: int, data: bytes) -> None:
+        """Write the spill file of a level."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(depth).write_bytes(data)
+
+    def _forget(self, depth: int) -> None:
+        """Remove any stored copy of the level at the given depth."""
+        self._memory.pop(depth, None)
+        self._encoded.pop(depth, None)  # not cancelled: a save may be waiting for it
+        if depth in self._on_disk:
+            self._on_disk.discard(depth)
+            self._io.submit(self._path(depth).unlink, missing_ok=True)
+
+    def _path(self, depth: int) -> Path:
+        """Return the spill file of a level."""
+        return self.directory / f"level-{depth}.lvl"
@@ -0,0 +1,96 @@
+"""Message log class."""
+
+import itertools
+import sys
+import textwrap
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from ..support import constants as const
+
+Color = tuple[int, int, int]
+
+
+@lru_cache(maxsize=const.MSG_WRAP_CACHE)
+def wrap(text: str, width: int) -> tuple[str, ...]:
+    """Return the lines of a message wrapped to a width (cached, as the same messages come up again and again)."""
+    return tuple(textwrap.wrap(text, width))
+
+
+@dataclass(slots=True)
+class Message:
+    """A message in the history, with the number of times in a row it was given."""
+
+    text: str
+    color: Color
+    count: int = 1
+
+    @property
+    def full_text(self) -> str:
+        """Return the text as shown, with the count of repeats if there are any."""
+        return self.text if self.count == 1 else f"{self.text} x{self.count}"
+
+
+class MessageLog:
+    """The game's messages: the last lines for the panel (a ring buffer), and a bounded history."""
+
+    def __init__(self, width: int = const.MSG_WIDTH, height: int = const.MSG_HEIGHT, history: int = const.MSG_HISTORY):
+        """Initialize class."""
+        self.width = width
+        self.history: deque[Message] = deque(maxlen=history)
+        self.lines: deque[tuple[str, Color]] = deque(maxlen=height)  # the panel lines, oldest first
+        self.added = 0  # messages added to the history so far, including the ones it dropped
+        self.version = 0  # goes up on every change, so views can tell they're out of date
+
+    def __iter__(self) -> Iterator[tuple[str, Color]]:
+        """Iterate over the panel lines and their colors, oldest first."""
+        return iter(self.lines)
+
+    def __len__(self) -> int:
+        """Return the number of panel lines."""
+        return len(self.lines)
+
+    def add(self, text: str, color: Color) -> None:
+        """Add a message, or count it again if it's the same as the last one."""
+        text = sys.intern(text)
+        last = self.history[-1] if self.history else None
+        if last is not None and last.text == text and last.color == color:
+            # take the last message's lines off the panel, to show them again with the count
+            for _ in range(min(len(wrap(last.full_text, self.width)), len(self.lines))):
+                self.lines.pop()
+            last.count += 1
+        else:
+            last = Message(text, color)
+            self.history.append(last)
+            self.added += 1
+        self.lines.extend((line, color) for line in wrap(last.full_text, self.width))
+        self.version += 1
+
+    def search(self, term: str) -> list[Message]:
+        """Return the messages in the history containing some text, ignoring case, oldest first."""
+        term = term.casefold()
+        return [message for message in self.history if term in message.text.casefold()]
+
+    def wrapped(self, width: int) -> list[tuple[str, Color]]:
+        """Return the whole history as lines wrapped to a width, oldest first, e.g. for a history view."""
+        return [(line, message.color) for message in self.history for line in wrap(message.full_text, width)]
+
+    def records(self, since: int = 0) -> list[list[Any]]:
+        """Return the messages as plain [text, color, count] records, from the one numbered ``since`` (in ``added`` order)."""
+        start = max(0, since - (self.added - len(self.history)))
+        return [[message.text, list(message.color), message.count] for message in itertools.islice(self.history, start, None)]
+
+    def load(self, records: Iterable[list[Any]], added: int | None = None) -> None:
+        """Replace the messages with saved records ([text, color] or [text, color, count])."""
+        records = list(records)
+        self.history.clear()
+        self.lines.clear()
+        for text, color, *count in records:
+            message = Message(sys.intern(text), tuple(color), *count)
+            self.history.append(message)
+            self.lines.extend((line, message.color) for line in wrap(message.full_text, self.width))
+        self.added = len(records) if added is None else added
+        self.version += 1
@@ -1,17 +1,19 @@
 """Object class."""
 
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
-from tcod import libtcodpy
+import numpy as np
 
+from ..support import constants as const
 from ..support import variables as var
 from ..support.common import is_blocked
+from ..support.pathfinding import NEIGHBOURS
 from .item import Item
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class Object:
     """This is generic object: the player, a monster, an item, the stairs... It's always represented by a character on screen."""
 
@@ -27,6 +29,7 @@ class Object:
     item: Any | None = None
     equipment: Any | None = None
     level: int | None = None
+    speed: int = field(default_factory=lambda: const.NORMAL_SPEED)
 
     def __post_init__(self):
         """Set properties after initialization."""
@@ -49,8 +52,7 @@ class Object:
     def move(self, dx: int, dy: int) -> None:
         """Move by the given amount, if the destination is not blocked."""
         if not is_blocked(self.x + dx, self.y + dy):
-            self.x += dx
-            self.y += dy
+            var.game_objects.relocate(self, self.x + dx, self.y + dy)
 
     def move_towards(self, target_x: int, target_y: int) -> None:
         """Vector from this object to the target, and distance."""
@@ -64,6 +66,19 @@ class Object:
         dy = int(round(dy / distance))
         self.move(dx, dy)
 
+    def move_downhill(self, distance: np.ndarray) -> None:
+        """Step to the free neighbouring tile that is closest to the target of a distance map, if any is closer."""
+        best = distance[self.x, self.y]
+        step = None
+        for dx, dy in NEIGHBOURS:
+            x = self.x + dx
+            y = self.y + dy
+            if var.game_map.in_bounds(x, y) and distance[x, y] < best and not is_blocked(x, y):
+                best = distance[x, y]
+                step = (dx, dy)
+        if step is not None:
+            self.move(*step)
+
     def distance_to(self, other: type["Object"]) -> float:
         """Return the distance to another object."""
         dx = other.x - self.x
@@ -78,21 +93,3 @@ class Object:
         """Make this object be drawn first, so all others appear above it if they're in the same tile."""
         var.game_objects.remove(self)
         var.game_objects.insert(0, self)
-
-    def draw(self) -> None:
-        """Set the color and then draw the character that represents this object at its position."""
-        if var.fov_map is None or var.CON is None:
-            return
-        # only show if it's visible to the player;
-        # or it's set to "always visible" and on an explored tile
-        if libtcodpy.map_is_in_fov(var.fov_map, self.x, self.y) or (
-            self.always_visible and var.game_map[self.x][self.y].explored
-        ):
-            var.CON.default_fg = self.color
-            libtcodpy.console_put_char(var.CON, self.x, self.y, self.char, libtcodpy.BKGND_NONE)
-
-    def clear(self) -> None:
-        """Erase the character that represents this object."""
-        if var.CON is None:
-            return
-        libtcodpy.console_put_char(var.CON, self.x, self.y, " ", libtcodpy.BKGND_NONE)
@@ -0,0 +1,240 @@
+"""Object store class."""
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import numpy as np
+
+COMPONENTS = ("fighter", "ai", "item", "equipment")
+INITIAL_CAPACITY = 64
+
+
+class ObjectStore:
+    """The ordered list of objects on the map, indexed by their position, with their data in columns."""
+
+    # the columns, indexed by slot
+    x: np.ndarray
+    y: np.ndarray
+    char: np.ndarray
+    color: np.ndarray
+    always_visible: np.ndarray
+
+    def __init__(self, objects: Iterable[Any] = ()):
+        """Initialize class."""
+        self._objects: list[Any] = []
+        self._by_position: dict[tuple[int, int], list[Any]] = {}
+
+        self._slots: dict[Any, int] = {}  # object -> its slot in the columns
+        self._entities: list[Any | None] = []  # slot -> object, None for a free slot
+        self._free: list[int] = []
+        self._members: dict[str, set[int]] = {name: set() for name in COMPONENTS}
+        self._slot_arrays: dict[str | None, np.ndarray] = {}  # cached results of slots()
+        self._drawing_order: np.ndarray | None = None
+        self._touched: set[Any] = set()  # objects changed since the last pop_touched(), for the autosave
+        self.version = 0  # goes up on every change made through the store, so views can tell they're out of date
+        self.order_version = 0  # goes up when objects are added or removed
+        self._allocate(INITIAL_CAPACITY)
+
+        for obj in objects:
+            self.append(obj)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the objects in drawing order."""
+        return iter(self._objects)
+
+    def __len__(self) -> int:
+        """Return the number of objects."""
+        return len(self._objects)
+
+    def __contains__(self, obj: Any) -> bool:
+        """Return True if the object is in the store."""
+        return obj in self._slots
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the object at the given drawing position."""
+        return self._objects[index]
+
+    def index(self, obj: Any) -> int:
+        """Return the drawing position of an object."""
+        for i, other in enumerate(self._objects):
+            if other is obj:
+                return i
+        raise ValueError(f"{obj!r} is not in the object store")
+
+    def append(self, obj: Any) -> None:
+        """Add an object on top of all others."""
+        self._objects.append(obj)
+        self._by_position.setdefault((obj.x, obj.y), []).append(obj)
+        self._add_slot(obj)
+
+    def insert(self, index: int, obj: Any) -> None:
+        """Add an object at the given drawing position."""
+        self._objects.insert(index, obj)
+        bucket = self._by_position.setdefault((obj.x, obj.y), [])
+        if index == 0:
+            bucket.insert(0, obj)
+        else:
+            # the objects on a tile are kept in drawing order too
+            below = self._objects[: self.index(obj)]
+            bucket.insert(sum(1 for other in below if other.x == obj.x and other.y == obj.y), obj)
+        self._add_slot(obj)
+
+    def remove(self, obj: Any) -> None:
+        """Remove an object from the map."""
+        del self._objects[self.index(obj)]
+        self._unlink(obj)
+        slot = self._slots.pop(obj)
+        self._entities[slot] = None
+        self._free.append(slot)
+        for members in self._members.values():
+            members.discard(slot)
+        self._touched.discard(obj)
+        self._changed()
+
+    def relocate(self, obj: Any, x: int, y: int) -> None:
+        """Move an object to new coordinates, keeping the position index up to date."""
+        slot = self._slots.get(obj)
+        if slot is not None:
+            self._unlink(obj)
+            self._by_position.setdefault((x, y), []).append(obj)
+            self.x[slot] = x
+            self.y[slot] = y
+            self._touched.add(obj)
+            self.version += 1
+        obj.x = x
+        obj.y = y
+
+    def update(self, obj: Any) -> None:
+        """Copy an object's glyph, color and components to the columns, after they were changed directly."""
+        slot = self._slots.get(obj)
+        if slot is None:
+            return
+        if self._write(slot, obj):
+            self._slot_arrays.clear()
+        self._touched.add(obj)
+        self.version += 1
+
+    def touch(self, obj: Any) -> None:
+        """Mark an object as changed, after changing something the columns don't hold (hit points, AI...)."""
+        if obj in self._slots:
+            self._touched.add(obj)
+
+    def pop_touched(self) -> set[Any]:
+        """Return the objects changed since the last call."""
+        touched, self._touched = self._touched, set()
+        return touched
+
+    def at(self, x: int, y: int) -> list[Any]:
+        """Return all objects on the given tile."""
+        return list(self._by_position.get((x, y), ()))
+
+    def blocking_at(self, x: int, y: int) -> Any | None:
+        """Return the object blocking the given tile, or None if there is none."""
+        for obj in self._by_position.get((x, y), ()):
+            if obj.blocks:
+                return obj
+        return None
+
+    def in_radius(self, x: int, y: int, radius: float) -> list[Any]:
+        """Return all objects within the given distance of some coordinates."""
+        return self.objects(self.within(x, y, radius))
+
+    def slots(self, component: str | None = None) -> np.ndarray:
+        """Return the slots of all objects with a component (one of COMPONENTS), or of all objects, in slot order."""
+        slots = self._slot_arrays.get(component)
+        if slots is None:
+            members = self._slots.values() if component is None else self._members[component]
+            slots = self._slot_arrays[component] = np.fromiter(sorted(members), np.intp, len(members))
+        return slots
+
+    def slot(self, obj: Any) -> int:
+        """Return the slot of an object in the columns."""
+        return self._slots[obj]
+
+    def drawing_order(self) -> np.ndarray:
+        """Return the slots of all objects in drawing order."""
+        if self._drawing_order is None:
+            slots = self._slots
+            self._drawing_order = np.fromiter((slots[obj] for obj in self._objects), np.intp, len(self._objects))
+        return self._drawing_order
+
+    def objects(self, slots: Iterable[int]) -> list[Any]:
+        """Return the objects in some slots."""
+        entities = self._entities
+        return [entities[slot] for slot in np.asarray(slots).tolist()]
+
+    def seen(self, visible: np.ndarray, component: str | None = None) -> np.ndarray:
+        """Return the slots of the objects (with a component, if given) standing on tiles marked in a map-sized mask."""
+        slots = self.slots(component)
+        return slots[visible[self.x[slots], self.y[slots]]]
+
+    def within(self, x: int, y: int, radius: float, component: str | None = None) -> np.ndarray:
+        """Return the slots of the objects (with a component, if given) within the given distance of some coordinates."""
+        slots = self.slots(component)
+        dx = self.x[slots] - x
+        dy = self.y[slots] - y
+        return slots[dx * dx + dy * dy <= radius * radius]
+
+    def _allocate(self, capacity: int) -> None:
+        """Create the columns, or grow them to a new capacity keeping their contents."""
+        old = len(self._entities)
+        columns = {
+            "x": np.zeros(capacity, np.int32),
+            "y": np.zeros(capacity, np.int32),
+            "char": np.zeros(capacity, np.int32),
+            "color": np.zeros((capacity, 3), np.uint8),
+            "always_visible": np.zeros(capacity, bool),
+        }
+        for name, column in columns.items():
+            if old:
+                column[:old] = getattr(self, name)
+            setattr(self, name, column)
+        self._entities.extend([None] * (capacity - old))
+        self._free.extend(range(capacity - 1, old - 1, -1))  # lowest slots are handed out first
+
+    def _add_slot(self, obj: Any) -> None:
+        """Give an object that was just added a slot in the columns."""
+        if not self._free:
+            self._allocate(2 * len(self._entities))
+        slot = self._free.pop()
+        self._slots[obj] = slot
+        self._entities[slot] = obj
+        self.x[slot] = obj.x
+        self.y[slot] = obj.y
+        self._write(slot, obj)
+        self._touched.add(obj)
+        self._changed()
+
+    def _write(self, slot: int, obj: Any) -> bool:
+        """Copy everything but the position of an object to its slot and update its memberships (True if one changed)."""
+        self.char[slot] = ord(obj.char) if isinstance(obj.char, str) else obj.char
+        self.color[slot] = obj.color
+        self.always_visible[slot] = obj.always_visible
+        changed = False
+        for name, members in self._members.items():
+            has = getattr(obj, name) is not None
+            if has != (slot in members):
+                changed = True
+                if has:
+                    members.add(slot)
+                else:
+                    members.discard(slot)
+        return changed
+
+    def _changed(self) -> None:
+        """Forget the cached slot arrays, after an object was added or removed."""
+        self._slot_arrays.clear()
+        self._drawing_order = None
+        self.version += 1
+        self.order_version += 1
+
+    def _unlink(self, obj: Any) -> None:
+        """Remove an object from the position index."""
+        position = (obj.x, obj.y)
+        bucket = self._by_position[position]
+        for i, other in enumerate(bucket):
+            if other is obj:
+                del bucket[i]
+                break
+        if not bucket:
+            del self._by_position[position]
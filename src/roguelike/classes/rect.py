@@ -1,9 +1,9 @@
 """Rect class."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class Rect:
     """a rectangle on the map. used to characterize a room."""
 
@@ -11,6 +11,8 @@ class Rect:
     y1: int
     w: int
     h: int
+    x2: int = field(init=False)
+    y2: int = field(init=False)
 
     def __post_init__(self):
         """Set properties after initializaion."""
@@ -0,0 +1,38 @@
+"""Spawn table class."""
+
+from tcod import libtcodpy
+
+
+class SpawnTable:
+    """Weighted random choice between names in constant time, with Vose's alias method."""
+
+    def __init__(self, weights: dict[str, int]):
+        """Initialize class from the weight of each name (names with no weight are left out)."""
+        self.names = [name for name, weight in weights.items() if weight > 0]
+        self.total = sum(weights[name] for name in self.names)
+        count = len(self.names)
+
+        # scale the weights so a column holds `total`; split the columns that are too small or too large
+        scaled = [weights[name] * count for name in self.names]
+        self.threshold = [self.total] * count
+        self.alias = list(range(count))
+        small = [i for i, weight in enumerate(scaled) if weight < self.total]
+        large = [i for i, weight in enumerate(scaled) if weight >= self.total]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.threshold[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= self.total - scaled[less]
+            (small if scaled[more] < self.total else large).append(more)
+
+    def __bool__(self) -> bool:
+        """Return True if there is anything to choose from."""
+        return bool(self.names)
+
+    def choose(self, rng) -> str | None:
+        """Return a random name, with odds proportional to its weight, or None if the table is empty."""
+        if not self.names:
+            return None
+        dice = libtcodpy.random_get_int(rng, 0, len(self.names) * self.total - 1)
+        column, offset = divmod(dice, self.total)
+        return self.names[column if offset < self.threshold[column] else self.alias[column]]
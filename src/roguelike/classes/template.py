@@ -0,0 +1,51 @@
+"""Template class."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..support import constants as const
+from ..support.registry import get_function
+from .basic_monster import BasicMonster
+from .equipment import Equipment
+from .fighter import Fighter
+from .item import Item
+from .object import Object
+
+# AI components templates can use, by name
+AI_CLASSES = {"basic": BasicMonster}
+
+
+@dataclass(frozen=True)
+class Template:
+    """A kind of monster or item, as defined in the content file, that objects are spawned from."""
+
+    name: str
+    char: int | str
+    color: tuple[int, int, int]
+    chances: tuple[tuple[int, int], ...] = ()  # (chance, from dungeon level) pairs
+    blocks: bool = False
+    always_visible: bool = False
+    fighter: dict[str, int] | None = None  # Fighter arguments
+    death_function: str | None = None
+    ai: str | None = None
+    use_function: str | None = None
+    equipment: dict[str, Any] | None = None  # Equipment arguments
+    speed: int = field(default_factory=lambda: const.NORMAL_SPEED)
+
+    def spawn(self, x: int, y: int) -> Object:
+        """Return a new object of this kind at the given position."""
+        fighter = Fighter(**self.fighter, death_function=get_function(self.death_function)) if self.fighter else None
+        return Object(
+            x,
+            y,
+            self.char,
+            self.name,
+            self.color,
+            blocks=self.blocks,
+            always_visible=self.always_visible,
+            fighter=fighter,
+            ai=AI_CLASSES[self.ai]() if self.ai else None,
+            item=Item(use_function=get_function(self.use_function)) if self.use_function else None,
+            equipment=Equipment(**self.equipment) if self.equipment else None,
+            speed=self.speed,
+        )
@@ -0,0 +1,276 @@
+"""Background autosave: full snapshots plus an incremental journal, written by a worker thread."""
+
+import json
+import logging
+import queue
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from . import constants as const
+from . import variables as var
+from .savefile import decode, encode, object_record, restore, snapshot, write_atomically
+
+LENGTH = struct.Struct("<I")
+
+log = logging.getLogger(__name__)
+
+
+class Autosaver:
+    """Periodically autosaves the running game from a background thread."""
+
+    def __init__(
+        self,
+        path: str | Path = const.AUTOSAVE_FILE,
+        interval: int = const.AUTOSAVE_INTERVAL,
+        snapshot_every: int = const.AUTOSAVE_SNAPSHOT_EVERY,
+    ):
+        """Initialize class and start the worker thread."""
+        self.path = Path(path)
+        self.journal_path = journal_path(self.path)
+        self.interval = interval
+        self.snapshot_every = snapshot_every
+
+        self.generation = 0
+        self.turns = 0
+        self.entries = 0
+        self.next_key = 0
+        self.keys: dict[Any, int] = {}  # object -> key
+        self.records: dict[int, dict[str, Any]] = {}  # key -> last saved record
+        self.order: list[int] = []
+        self.order_version = 0  # the object store's order_version when the order was saved
+        self.inventory: list[int] = []
+        self.message_version = 0
+        self.message_mark = 0  # number of the first message a journal entry has to save again
+        self.scalars: dict[str, Any] = {}
+        self.game_map = None
+        self.explored: np.ndarray | None = None
+        self.failed_generation: int | None = None  # set by the worker when a write fails, to start a new generation
+
+        self.jobs: queue.Queue = queue.Queue()
+        self.worker = threading.Thread(target=self.work, name="autosave", daemon=True)
+        self.worker.start()
+
+    def turn_played(self) -> None:
+        """Count a played turn, autosaving when the interval is reached."""
+        self.turns += 1
+        if self.turns >= self.interval:
+            self.autosave()
+
+    def autosave(self) -> None:
+        """Queue a journal entry with the changes since the last autosave, or a full snapshot if it's due."""
+        self.turns = 0
+        failed = self.failed_generation == self.generation
+        if var.game_map is not self.game_map or self.entries >= self.snapshot_every or failed:
+            self.take_snapshot()
+        else:
+            self.take_delta()
+
+    def take_snapshot(self) -> None:
+        """Queue a full snapshot of the game, starting a new journal generation."""
+        self.generation = time.time_ns()  # unique across sessions, unlike a counter
+        self.entries = 0
+        state = snapshot()
+        state["autosave_generation"] = self.generation
+
+        # keys are the positions in the snapshot: objects first, then the inventory
+        objects = [*var.game_objects, *var.inventory]
+        records = state["objects"] + state["inventory"]
+        self.keys = {obj: key for key, obj in enumerate(objects)}
+        self.next_key = len(objects)
+        self.records = dict(enumerate(records))
+        self.order = list(range(len(var.game_objects)))
+        self.order_version = var.game_objects.order_version
+        var.game_objects.pop_touched()  # all in the snapshot
+        self.inventory = list(range(len(var.game_objects), len(objects)))
+        self.message_version = var.game_msgs.version
+        self.message_mark = max(var.game_msgs.added - 1, 0)
+        self.scalars = self.current_scalars()
+        self.game_map = var.game_map
+        self.explored = np.asarray(var.game_map.explored)
+
+        self.jobs.put(("snapshot", self.generation, state))
+
+    def take_delta(self) -> None:
+        """Queue a journal entry with everything that changed since the last autosave."""
+        delta: dict[str, Any] = {"generation": self.generation}
+
+        # the inventory is small and changes without the store knowing, so it's always looked at
+        changed = {}
+        for obj in (*var.game_objects.pop_touched(), *var.inventory):
+            key = self.key(obj)
+            record = object_record(obj)
+            if self.records.get(key) != record:
+                self.records[key] = record
+                changed[key] = record
+        if changed:
+            delta["changed"] = changed
+
+        reordered = var.game_objects.order_version != self.order_version
+        if reordered:
+            self.order_version = var.game_objects.order_version
+            order = [self.key(obj) for obj in var.game_objects]
+            if order != self.order:
+                self.order = delta["order"] = order
+        inventory = [self.key(obj) for obj in var.inventory]
+        if inventory != self.inventory:
+            self.inventory = delta["inventory"] = inventory
+            reordered = True
+
+        if reordered:
+            # only forget records of objects that are gone for good
+            for key in set(self.records) - set(self.order) - set(self.inventory):
+                del self.records[key]
+            self.keys = {obj: key for obj, key in self.keys.items() if key in self.records}
+
+        now_explored = np.asarray(var.game_map.explored)
+        explored = np.flatnonzero(now_explored & ~self.explored)
+        if explored.size:
+            self.explored = now_explored
+            delta["explored"] = explored.tolist()
+
+        # the messages added since, and the last one saved again as its repeat count may have gone up
+        if var.game_msgs.version != self.message_version:
+            delta["messages"] = [self.message_mark, var.game_msgs.records(self.message_mark)]
+            self.message_version = var.game_msgs.version
+            self.message_mark = max(var.game_msgs.added - 1, 0)
+        scalars = self.current_scalars()
+        if scalars != self.scalars:
+            self.scalars = delta["scalars"] = scalars
+
+        self.entries += 1
+        self.jobs.put(("journal", self.generation, delta))
+
+    def key(self, obj: Any) -> int:
+        """Return the journal key of an object, giving new objects a fresh one."""
+        if obj not in self.keys:
+            self.keys[obj] = self.next_key
+            self.next_key += 1
+        return self.keys[obj]
+
+    def current_scalars(self) -> dict[str, Any]:
+        """Return the game state values that aren't objects, tiles or messages."""
+        return {
+            "dungeon_level": var.dungeon_level,
+            "game_state": var.game_state,
+            "player": self.key(var.player),
+            "stairs": self.key(var.stairs),
+            "upstairs": None if var.upstairs is None else self.key(var.upstairs),
+        }
+
+    def work(self) -> None:
+        """Worker thread: encode and write queued snapshots and journal entries in order, logging any failure."""
+        while True:
+            job = self.jobs.get()
+            try:
+                if job is None:
+                    return
+                kind, generation, data = job
+                if kind == "snapshot":
+                    write_atomically(self.path, encode(data))
+                    self.journal_path.write_bytes(b"")
+                elif generation != self.failed_generation:  # entries after a lost one would be wrong
+                    entry = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+                    with self.journal_path.open("ab") as journal:
+                        journal.write(LENGTH.pack(len(entry)) + entry)
+            except Exception:
+                log.exception("Autosave failed, the next one will be a full snapshot")
+                self.failed_generation = generation
+            finally:
+                self.jobs.task_done()
+
+    def flush(self) -> None:
+        """Wait until everything queued so far is written."""
+        self.jobs.join()
+
+    def close(self) -> None:
+        """Write what's queued and stop the worker thread."""
+        self.jobs.put(None)
+        self.worker.join()
+
+
+def journal_path(path: str | Path) -> Path:
+    """Return the journal file that goes with an autosave."""
+    path = Path(path)
+    return path.with_name(path.name + ".journal")
+
+
+def read_journal(path: str | Path) -> list[dict[str, Any]]:
+    """Return the journal entries, ignoring a last entry cut short by a crash."""
+    path = journal_path(path)
+    data = path.read_bytes() if path.exists() else b""
+    entries = []
+    offset = 0
+    while offset + LENGTH.size <= len(data):
+        (length,) = LENGTH.unpack_from(data, offset)
+        offset += LENGTH.size
+        if offset + length > len(data):
+            break
+        entries.append(json.loads(zlib.decompress(data[offset : offset + length])))
+        offset += length
+    return entries
+
+
+def recover(path: str | Path = const.AUTOSAVE_FILE) -> dict[str, Any]:
+    """Return the latest autosaved state: the snapshot with its journal replayed on top."""
+    state = decode(Path(path).read_bytes())
+    generation = state.get("autosave_generation")
+
+    num_objects = len(state["objects"])
+    records = dict(enumerate(state["objects"] + state["inventory"]))
+    order = list(range(num_objects))
+    inventory = list(range(num_objects, len(records)))
+    scalars = {"player": state["player_index"], "stairs": state["stairs_index"], "upstairs": state["upstairs_index"]}
+    width, height, planes = state["map"]
+    plane_size = (width * height + 7) // 8
+    explored = np.unpackbits(np.frombuffer(planes, np.uint8, plane_size, 2 * plane_size), count=width * height)
+
+    for delta in read_journal(path):
+        if delta["generation"] != generation:
+            continue
+        records.update({int(key): record for key, record in delta.get("changed", {}).items()})
+        order = delta.get("order", order)
+        inventory = delta.get("inventory", inventory)
+        explored[delta.get("explored", [])] = 1
+        if "messages" in delta:
+            apply_messages(state, *delta["messages"])
+        if "scalars" in delta:
+            scalars = delta["scalars"]
+            state["dungeon_level"] = scalars["dungeon_level"]
+            state["game_state"] = scalars["game_state"]
+
+    state["objects"] = [records[key] for key in order]
+    state["inventory"] = [records[key] for key in inventory]
+    state["player_index"] = order.index(scalars["player"])
+    state["stairs_index"] = order.index(scalars["stairs"])
+    state["upstairs_index"] = None if scalars["upstairs"] is None else order.index(scalars["upstairs"])
+    state["map"] = (width, height, planes[: 2 * plane_size] + np.packbits(explored).tobytes())
+    return state
+
+
+def apply_messages(state: dict[str, Any], since: int, records: list[list[Any]]) -> None:
+    """Replace a state's messages from the one numbered ``since`` on with the records of a journal entry."""
+    messages = state["messages"]
+    added = state.get("messages_added", len(messages))
+    del messages[max(len(messages) - (added - since), 0) :]
+    messages.extend(records)
+    del messages[: -const.MSG_HISTORY]
+    state["messages_added"] = since + len(records)
+
+
+def load_newest_game() -> None:
+    """Load whichever is newer: the regular save, or the autosave with its journal (after a crash)."""
+    candidates = [
+        (max(path.stat().st_mtime, journal_path(path).stat().st_mtime if journal_path(path).exists() else 0), path)
+        for path in (Path(const.SAVE_FILE), Path(const.AUTOSAVE_FILE))
+        if path.exists()
+    ]
+    if not candidates:
+        raise FileNotFoundError("No saved game to load")
+    _, path = max(candidates)
+    restore(recover(path) if path == Path(const.AUTOSAVE_FILE) else decode(path.read_bytes()))
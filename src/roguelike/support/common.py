@@ -1,54 +1,92 @@
 """Support file with common help functions."""
 
-import textwrap
 from typing import Any
 
+import tcod
+from tcod import libtcodpy
+
 from . import constants as const
 from . import variables as var
+from ..classes.chunked_plane import ChunkedPlane
 from .colors import Colors
 
 
 def get_equipped_in_slot(slot) -> Any:
     """Returns the equipment in a slot, or None if it's empty."""
-    for obj in var.inventory:
-        if obj.equipment and obj.equipment.slot == slot and obj.equipment.is_equipped:
-            return obj.equipment
-    return None
+    return var.equipped_slots.get(slot)
+
+
+def index_equipment() -> None:
+    """Rebuild the slot index from the inventory, e.g. after starting or loading a game."""
+    var.equipped_slots = {
+        item.equipment.slot: item.equipment for item in var.inventory if item.equipment and item.equipment.is_equipped
+    }
+    var.equipment_bonus = None
+
+
+def get_equipment_bonus() -> dict[str, int]:
+    """Returns the power, defense and max_hp bonuses summed over all equipped items."""
+    if var.equipment_bonus is None:
+        equipped = var.equipped_slots.values()
+        var.equipment_bonus = {
+            "power": sum(equipment.power_bonus for equipment in equipped),
+            "defense": sum(equipment.defense_bonus for equipment in equipped),
+            "max_hp": sum(equipment.max_hp_bonus for equipment in equipped),
+        }
+    return var.equipment_bonus
 
 
 def message(new_msg: str, color: tuple[int, int, int] = Colors.WHITE) -> None:
-    """Split the message if necessary, among multiple lines."""
-    new_msg_lines = textwrap.wrap(new_msg, const.MSG_WIDTH)
+    """Add a message to the log, which splits it among multiple lines if necessary."""
+    var.game_msgs.add(new_msg, color)
+
 
-    for line in new_msg_lines:
-        # if the buffer is full, remove the first line to make room for the new one
-        if len(var.game_msgs) == const.MSG_HEIGHT:
-            del var.game_msgs[0]
+def initialize_fov() -> None:
+    """Initialize field of view."""
+    # the visible tiles, in [x, y] order like the map itself
+    var.visible = ChunkedPlane(var.game_map.width, var.game_map.height)
 
-        # add the new line as a tuple, with the tex and the color
-        var.game_msgs.append((line, color))
+    if var.CON is not None:
+        libtcodpy.console_clear(var.CON)  # unexplored areas start black (which is the default background color)
+    var.frame_cache.invalidate()
+    var.fov_recompute = True
+    refresh_fov()
 
 
-def get_all_equipped(obj) -> list:
-    """Returns a list of equipped items."""
-    if obj == var.player:
-        equipped_list = []
-        for item in var.inventory:
-            if item.equipment and item.equipment.is_equipped:
-                equipped_list.append(item.equipment)
-        return equipped_list
-    else:
-        return []  # other objects have no equipment
+def refresh_fov() -> None:
+    """Recompute the player's field of view if it was invalidated, and cache the result."""
+    if var.fov_recompute:
+        var.fov_recompute = False
+        game_map = var.game_map
+        player = var.player
+
+        # nothing past the torch radius can be seen, so only the tiles around the player are looked at
+        radius = const.TORCH_RADIUS or max(game_map.width, game_map.height)
+        x1, y1 = max(player.x - radius, 0), max(player.y - radius, 0)
+        x2, y2 = min(player.x + radius + 1, game_map.width), min(player.y + radius + 1, game_map.height)
+        fov = tcod.map.compute_fov(
+            ~game_map.block_sight[x1:x2, y1:y2],
+            (player.x - x1, player.y - y1),
+            const.TORCH_RADIUS,
+            const.FOV_LIGHT_WALLS,
+            const.FOV_ALGO,
+        )
+        var.visible.clear()
+        var.visible[x1:x2, y1:y2] = fov
+
+        # tiles that are visible right now become explored
+        game_map.explored[x1:x2, y1:y2] = game_map.explored[x1:x2, y1:y2] | fov
+
+
+def is_in_fov(x: int, y: int) -> bool:
+    """Return True if the tile is inside the map and visible to the player."""
+    return var.visible is not None and var.game_map.in_bounds(x, y) and bool(var.visible[x, y])
 
 
 def is_blocked(x: int, y: int) -> bool:
     """First test the map tile."""
-    if var.game_map[x][y].blocked:
+    if var.game_map.blocked[x, y]:
         return True
 
     # now check for any blocking objects
-    for g_object in var.game_objects:
-        if g_object.blocks and g_object.x == x and g_object.y == y:
-            return True
-
-    return False
+    return var.game_objects.blocking_at(x, y) is not None
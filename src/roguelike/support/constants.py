@@ -11,29 +11,37 @@ HEALINGPOTION_TILE = 262
 SWORD_TILE = 263
 SHIELD_TILE = 264
 STAIRSDOWN_TILE = 265
+STAIRSUP_TILE = ord("<")  # the tileset has no upward stairs
 DAGGER_TILE = 266
 
 # actual size of the window
 SCREEN_WIDTH = 80
 SCREEN_HEIGHT = 50
 
-# size of the map
+# size of the map (it can be bigger than the view, which follows the player)
 MAP_WIDTH = 80
 MAP_HEIGHT = 43
+MAP_CHUNK_SIZE = 32  # side of the square chunks map planes are stored in (a power of two)
 
 # sizes and coordinates relevant for the GUI
 BAR_WIDTH = 20
 PANEL_HEIGHT = 7
 PANEL_Y = SCREEN_HEIGHT - PANEL_HEIGHT
+VIEW_WIDTH = SCREEN_WIDTH  # the part of the screen showing the map, which scrolls on bigger maps
+VIEW_HEIGHT = PANEL_Y
 MSG_X = BAR_WIDTH + 2
 MSG_WIDTH = SCREEN_WIDTH - BAR_WIDTH - 2
 MSG_HEIGHT = PANEL_HEIGHT - 1
+MSG_HISTORY = 1000  # messages kept for the history view (repeats in a row count once)
+MSG_WRAP_CACHE = 4096  # distinct (message, width) pairs whose wrapped lines are kept
 INVENTORY_WIDTH = 50
 
 # parameters for dungeon generator
 ROOM_MAX_SIZE = 10
 ROOM_MIN_SIZE = 6
 MAX_ROOMS = 30
+ROOM_PLACEMENT = "random"  # "random": up to MAX_ROOMS rooms; "bsp": rooms all over the map, for large maps
+BSP_MAX_RATIO = 1.5  # how much longer than wide (or wide than long) a BSP leaf can be
 
 # spell values
 HEAL_AMOUNT = 40
@@ -44,6 +52,10 @@ CONFUSE_RANGE = 8
 FIREBALL_RADIUS = 3
 FIREBALL_DAMAGE = 25
 
+# turn scheduling: an actor with speed NORMAL_SPEED acts once per ACTION_COST ticks
+NORMAL_SPEED = 100
+ACTION_COST = 10000
+
 # experience and level-ups
 LEVEL_UP_BASE = 200
 LEVEL_UP_FACTOR = 150
@@ -54,5 +66,21 @@ CHARACTER_SCREEN_WIDTH = 30
 FOV_ALGO = 0  # default FOV algorithm
 FOV_LIGHT_WALLS = True  # light walls or not
 TORCH_RADIUS = 10
+FLOW_FIELD_RADIUS = 30  # monsters find paths to the player through tiles up to this far from the player
+
+LIMIT_FPS = 20  # 20 frames-per-second maximum (frames are only drawn after input)
+
+PREGENERATE_AHEAD = 2  # levels below the player generated ahead of time
+PREGENERATE_WORKERS = 2
+LEVEL_CACHE_SIZE = 3  # visited levels kept in memory, older ones are spilled to disk
+
+PROFILE_WINDOW = 120  # frames the overlay's percentiles are taken over
+PROFILE_HISTORY = 10000  # frames kept for export
+PROFILE_FILE = "profile.csv"
+PROFILE_COLUMN_WIDTH = 27  # width of a span's entry in the overlay
 
-LIMIT_FPS = 20  # 20 frames-per-second maximum
+RECORDING_FILE = "recording.json"
+SAVE_FILE = "savegame.sav"
+AUTOSAVE_FILE = "savegame.autosave.sav"
+AUTOSAVE_INTERVAL = 10  # turns between autosaves
+AUTOSAVE_SNAPSHOT_EVERY = 20  # journal entries between full autosave snapshots
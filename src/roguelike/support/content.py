@@ -0,0 +1,90 @@
+"""Monster and item templates loaded from the content file, and the spawn tables built from them."""
+
+import json
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+from ..classes.spawn_table import SpawnTable
+from ..classes.template import Template
+from . import constants as const
+from .colors import Colors
+
+CONTENT_FILE = Path(__file__).parent.parent / "data" / "content.json"
+
+# defaults for every entry of a section of the content file
+DEFAULTS = {
+    "monsters": {"blocks": True, "ai": "basic", "death_function": "monster_death"},
+    "items": {"always_visible": True},  # items are visible even out-of-FOV, if in an explored area
+}
+
+
+@dataclass(frozen=True)
+class SpawnTables:
+    """What can be placed in a room at one dungeon level."""
+
+    max_monsters: int
+    max_items: int
+    monsters: SpawnTable
+    items: SpawnTable
+
+
+def from_dungeon_level(table, depth: int):
+    """Returns a value that depends on level. The table specifies what value occurs after each level, default is 0."""
+    for value, level in reversed(table):
+        if depth >= level:
+            return value
+    return 0
+
+
+def glyph(char: str) -> int | str:
+    """Return the character for a content file glyph: a tile name from the constants, or the character itself."""
+    return getattr(const, char) if char.endswith("_TILE") else char
+
+
+@cache
+def load_content() -> dict:
+    """Return the parsed content file."""
+    return json.loads(CONTENT_FILE.read_text())
+
+
+@cache
+def templates(section: str) -> dict[str, Template]:
+    """Return the templates of a section of the content file ("monsters" or "items"), by name."""
+    result = {}
+    for name, entry in load_content()[section].items():
+        fields = {**DEFAULTS[section], **entry}
+        fields["char"] = glyph(fields["char"])
+        fields["color"] = getattr(Colors, fields["color"])
+        fields["chances"] = tuple(tuple(pair) for pair in fields.get("chances", ()))
+        result[name] = Template(name=name, **fields)
+    return result
+
+
+def reload() -> None:
+    """Forget everything read from the content file, so it's read again (e.g. after pointing CONTENT_FILE elsewhere)."""
+    load_content.cache_clear()
+    templates.cache_clear()
+    spawn_tables.cache_clear()
+
+
+def template(name: str) -> Template:
+    """Return the monster or item template with the given name."""
+    for section in DEFAULTS:
+        if name in templates(section):
+            return templates(section)[name]
+    raise KeyError(f"No monster or item named {name!r} in the content file")
+
+
+@cache
+def spawn_tables(depth: int) -> SpawnTables:
+    """Return the spawn tables for a dungeon level (with no room for monsters or items if none can appear there)."""
+    rooms = load_content()["rooms"]
+    monsters = SpawnTable({name: from_dungeon_level(t.chances, depth) for name, t in templates("monsters").items()})
+    items = SpawnTable({name: from_dungeon_level(t.chances, depth) for name, t in templates("items").items()})
+    return SpawnTables(
+        max_monsters=from_dungeon_level(rooms["max_monsters"], depth) if monsters else 0,
+        max_items=from_dungeon_level(rooms["max_items"], depth) if items else 0,
+        monsters=monsters,
+        items=items,
+    )
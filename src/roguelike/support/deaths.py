@@ -0,0 +1,31 @@
+"""Death functions for the player and monsters."""
+
+from . import variables as var
+from .colors import Colors
+from .common import message
+from .registry import register
+
+
+@register
+def player_death(player):
+    """The game ended!"""
+    message("You died!", Colors.RED)
+    var.game_state = "dead"
+
+    # for added effect, transform the player into a corpse!
+    player.char = "%"
+    player.color = Colors.DARK_RED
+    var.game_objects.update(player)
+
+
+@register
+def monster_death(monster):
+    """Transform it into a nasty corpse! it doesn't block, can't be attacked and doesn't move."""
+    message(f"The {monster.name} is dead! You gain {str(monster.fighter.xp)} experience points.", Colors.ORANGE)
+    monster.char = "%"
+    monster.color = Colors.DARK_RED
+    monster.blocks = False
+    monster.fighter = None
+    monster.ai = None
+    monster.name = "remains of " + monster.name
+    monster.send_to_back()
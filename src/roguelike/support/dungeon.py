@@ -0,0 +1,222 @@
+"""Dungeon generation."""
+
+import math
+from dataclasses import dataclass
+
+import tcod
+import tcod.bsp
+from tcod import libtcodpy
+
+from ..classes.game_map import GameMap
+from ..classes.level_store import Level
+from ..classes.object import Object
+from ..classes.object_store import ObjectStore
+from ..classes.rect import Rect
+from . import constants as const
+from . import variables as var
+from .colors import Colors
+from .content import spawn_tables, templates
+from .rng import new_stream
+from .scheduler import Scheduler
+
+
+@dataclass
+class LevelDraft:
+    """A level being generated: its map, the objects placed so far and the stream its randomness comes from."""
+
+    game_map: GameMap
+    objects: ObjectStore
+    depth: int
+    rng: tcod.random.Random
+    start: tuple[int, int] = (0, 0)  # where the player arrives, kept free of monsters and items
+
+
+def create_room(game_map: GameMap, room: Rect):
+    """Create room."""
+    # make the tiles inside the rectangle (walls excluded) passable
+    game_map.carve(room.x1 + 1, room.y1 + 1, room.x2 - 1, room.y2 - 1)
+
+
+def create_h_tunnel(game_map: GameMap, x1: int, x2: int, y: int):
+    """Create horizontal tunnel."""
+    game_map.carve(x1, y, x2, y)
+
+
+def create_v_tunnel(game_map: GameMap, y1: int, y2: int, x: int):
+    """Create vertical tunnel."""
+    game_map.carve(x, y1, x, y2)
+
+
+def create_tunnel(game_map: GameMap, a: Rect, b: Rect, rng: tcod.random.Random):
+    """Connect the centers of two rooms with an L-shaped tunnel, bending one way or the other at random."""
+    (x1, y1) = center(a)
+    (x2, y2) = center(b)
+
+    # draw a coin (random number that is either 0 or 1)
+    if rng.randint(0, 1) == 1:
+        # first move horizontally, then vertically
+        create_h_tunnel(game_map, x1, x2, y1)
+        create_v_tunnel(game_map, y1, y2, x2)
+    else:
+        # first move vertically, then horizontally
+        create_v_tunnel(game_map, y1, y2, x1)
+        create_h_tunnel(game_map, x1, x2, y2)
+
+
+def center(room: Rect) -> tuple[int, int]:
+    """Return the center of a room, as tile coordinates."""
+    (x, y) = room.center()
+    return (int(x), int(y))
+
+
+def generate_level(seed: int, depth: int) -> Level:
+    """Generate a level from a seed, without touching the current game (the same seed and depth give the same level)."""
+    draft = LevelDraft(GameMap(const.MAP_WIDTH, const.MAP_HEIGHT), ObjectStore(), depth, new_stream(seed, "map", depth))
+    game_map, objects = draft.game_map, draft.objects
+
+    if const.ROOM_PLACEMENT == "bsp":
+        rooms = bsp_rooms(game_map, draft.rng)
+        draft.start = center(rooms[0])
+        for room in rooms:
+            place_objects(draft, room)
+    else:
+        rooms = random_rooms(draft)
+    start = draft.start
+
+    # create stairs at the center of the last room, drawn below the monsters
+    stairs = Object(*center(rooms[-1]), const.STAIRSDOWN_TILE, "stairs", Colors.WHITE, always_visible=True)
+    objects.insert(0, stairs)
+
+    # below the first level, the player arrives on stairs leading back up
+    upstairs = None
+    if depth > 1:
+        upstairs = Object(*start, const.STAIRSUP_TILE, "upward stairs", Colors.WHITE, always_visible=True)
+        objects.insert(0, upstairs)
+
+    return Level(game_map, list(objects), stairs, upstairs, start)
+
+
+def random_rooms(draft: LevelDraft) -> list[Rect]:
+    """Try MAX_ROOMS rooms at random positions, keeping those that don't overlap, each linked to the one before."""
+    game_map, rng = draft.game_map, draft.rng
+    rooms: list[Rect] = []
+    for _ in range(const.MAX_ROOMS):
+        # random width and height
+        width = libtcodpy.random_get_int(rng, const.ROOM_MIN_SIZE, const.ROOM_MAX_SIZE)
+        height = libtcodpy.random_get_int(rng, const.ROOM_MIN_SIZE, const.ROOM_MAX_SIZE)
+
+        # random position without going out of the boundaries of the map
+        x = libtcodpy.random_get_int(rng, 0, game_map.width - width - 1)
+        y = libtcodpy.random_get_int(rng, 0, game_map.height - height - 1)
+
+        # "Rect" class makes rectangles easier to work with
+        new_room = Rect(x, y, width, height)
+
+        # run through the other rooms and see if they intersect with this one
+        if any(new_room.intersect(other_room) for other_room in rooms):
+            continue
+
+        # this means there are no intersections, so this room is valid: "paint" it to the map's tiles
+        create_room(game_map, new_room)
+
+        if not rooms:
+            # this is the first room, where the player starts at
+            draft.start = center(new_room)
+        else:
+            # all rooms after the first: connect it to the previous room with a tunnel
+            create_tunnel(game_map, rooms[-1], new_room, rng)
+
+        # add some contents to this room, such as monsters
+        place_objects(draft, new_room)
+
+        # finally, append the new room to the list
+        rooms.append(new_room)
+    return rooms
+
+
+def bsp_rooms(game_map: GameMap, rng: tcod.random.Random) -> list[Rect]:
+    """Split the map into a BSP tree, put a room in every leaf and connect the rooms along the tree."""
+    leaf_size = const.ROOM_MAX_SIZE + 1  # a leaf holds a room and its walls
+    depth = max(1, math.ceil(math.log2(game_map.width * game_map.height / leaf_size**2)))
+    root = tcod.bsp.BSP(0, 0, game_map.width, game_map.height)
+    # tcod passes the generator straight to C, so it has to be given the underlying C object
+    root.split_recursive(
+        depth, const.ROOM_MIN_SIZE + 1, const.ROOM_MIN_SIZE + 1, const.BSP_MAX_RATIO, const.BSP_MAX_RATIO, seed=rng.random_c
+    )
+
+    rooms: dict[tcod.bsp.BSP, list[Rect]] = {}  # the rooms under each node whose parent isn't done yet
+    for node in root.inverted_level_order():  # children come before their parents
+        if not node.children:
+            # a room of random size at a random position inside the leaf, walls included
+            width = rng.randint(const.ROOM_MIN_SIZE, min(const.ROOM_MAX_SIZE, node.width - 1))
+            height = rng.randint(const.ROOM_MIN_SIZE, min(const.ROOM_MAX_SIZE, node.height - 1))
+            x = rng.randint(node.x, node.x + node.width - 1 - width)
+            y = rng.randint(node.y, node.y + node.height - 1 - height)
+            room = Rect(x, y, width, height)
+            create_room(game_map, room)
+            rooms[node] = [room]
+            continue
+
+        left, right = node.children
+        if node.horizontal:
+            middle = (node.x + node.width // 2, node.position)
+        else:
+            middle = (node.position, node.y + node.height // 2)
+        left_rooms, right_rooms = rooms.pop(left), rooms.pop(right)
+        create_tunnel(
+            game_map,
+            min(left_rooms, key=lambda room: math.dist(center(room), middle)),
+            min(right_rooms, key=lambda room: math.dist(center(room), middle)),
+            rng,
+        )
+        rooms[node] = left_rooms + right_rooms
+    return rooms[root]
+
+
+def enter_level(level: Level, x: int, y: int) -> None:
+    """Make a level the current one, with the player at the given position."""
+    var.game_map = level.game_map
+    var.game_objects = ObjectStore([var.player, *level.objects])
+    var.game_objects.relocate(var.player, x, y)
+    var.stairs = level.stairs
+    var.upstairs = level.upstairs
+    var.scheduler = Scheduler()  # everyone starts dormant
+
+
+def make_map():
+    """Generate the level for the current depth and put the player at its start."""
+    level = generate_level(var.seed, var.dungeon_level)
+    enter_level(level, *level.start)
+
+
+def place_objects(draft: LevelDraft, room: Rect):
+    """Choose random number of monsters and items for a room, keeping the player's start free."""
+    rng = draft.rng
+    tables = spawn_tables(draft.depth)
+    monsters = templates("monsters")
+    items = templates("items")
+
+    num_monsters = libtcodpy.random_get_int(rng, 0, tables.max_monsters)
+    for _ in range(num_monsters):
+        # choose random spot for this monster
+        x = libtcodpy.random_get_int(rng, room.x1 + 1, room.x2 - 1)
+        y = libtcodpy.random_get_int(rng, room.y1 + 1, room.y2 - 1)
+
+        # only place it if the tile is not blocked
+        if not is_blocked(draft, x, y):
+            draft.objects.append(monsters[tables.monsters.choose(rng)].spawn(x, y))
+
+    num_items = libtcodpy.random_get_int(rng, 0, tables.max_items)
+    for _ in range(num_items):
+        # choose random spot for this item
+        x = libtcodpy.random_get_int(rng, room.x1 + 1, room.x2 - 1)
+        y = libtcodpy.random_get_int(rng, room.y1 + 1, room.y2 - 1)
+
+        # only place it if the tile is not blocked
+        if not is_blocked(draft, x, y):
+            draft.objects.insert(0, items[tables.items.choose(rng)].spawn(x, y))  # items appear below other objects
+
+
+def is_blocked(draft: LevelDraft, x: int, y: int) -> bool:
+    """Return True if the tile is a wall, holds a blocking object or is where the player starts."""
+    return bool(draft.game_map.blocked[x, y]) or draft.objects.blocking_at(x, y) is not None or (x, y) == draft.start
@@ -0,0 +1,216 @@
+"""Game simulation: creating games and playing turns, without a window."""
+
+import random
+
+import numpy as np
+
+from ..classes.fighter import Fighter
+from ..classes.level_store import Level
+from ..classes.message_log import MessageLog
+from ..classes.object import Object
+from . import constants as const
+from . import variables as var
+from .colors import Colors
+from .common import index_equipment, initialize_fov, message, refresh_fov
+from .content import template
+from .deaths import player_death
+from .dungeon import enter_level, make_map
+from .profiler import span
+from .rng import seed_streams
+from .savefile import new_level_store
+from .scheduler import delay
+
+# actions the player can take, and how many extra values each one carries
+ACTIONS = {"move": 2, "pickup": 0, "use": 1, "drop": 1, "descend": 0, "ascend": 0}
+
+
+def check_level_up() -> None:
+    """See if the player's experience is enough to level-up."""
+    level_up_xp = const.LEVEL_UP_BASE + var.player.level * const.LEVEL_UP_FACTOR
+    if var.player.fighter.xp >= level_up_xp:
+        # it is! level up
+        var.player.level += 1
+        var.player.fighter.xp -= level_up_xp
+        message(f"Your battle skills grow stronger! You reached level {str(var.player.level)}!", Colors.YELLOW)
+
+        choice = None
+        while choice is None:  # keep asking until a choice is made
+            choice = var.interface.choose_level_up(
+                [
+                    f"Constitution (+20 HP, from {str(var.player.fighter.max_hp)})",
+                    f"Strength (+1 attack, from {str(var.player.fighter.base_power)})",
+                    f"Agility (+1 defense, from {str(var.player.fighter.base_defense)})",
+                ]
+            )
+
+        if choice == 0:
+            var.player.fighter.base_max_hp += 20
+            var.player.fighter.hp += 20
+        elif choice == 1:
+            var.player.fighter.base_power += 1
+        elif choice == 2:
+            var.player.fighter.base_defense += 1
+        var.game_objects.touch(var.player)
+
+
+def player_move_or_attack(dx: int, dy: int) -> None:
+    """Move or attach with player."""
+    # the coordinates the payer is moving to/attacking
+    x = var.player.x + dx
+    y = var.player.y + dy
+
+    # try to find an attackable object there
+    target = None
+    for g_object in var.game_objects.at(x, y):
+        if g_object.fighter:
+            target = g_object
+            break
+
+    # attack if target found, move otherwise
+    if target is not None:
+        var.player.fighter.attack(target)
+    else:
+        var.player.move(dx, dy)
+        var.fov_recompute = True
+
+
+def pick_up() -> None:
+    """Pick up an item lying on the player's tile."""
+    for g_object in var.game_objects.at(var.player.x, var.player.y):
+        if g_object.item:
+            g_object.item.pick_up()
+            break
+
+
+def player_turn(action: tuple) -> str | None:
+    """Perform a player action, returning "didnt-take-turn" if the monsters don't get to act afterwards."""
+    name, *args = action
+    if name not in ACTIONS or len(args) != ACTIONS[name]:
+        raise ValueError(f"Invalid action: {action!r}")
+    if name == "move" and args == [0, 0]:
+        raise ValueError(f"Invalid action: {action!r} (a move needs a direction)")
+
+    if name == "move":
+        player_move_or_attack(*args)
+        return None
+
+    if name == "pickup":
+        pick_up()
+    elif name in ("use", "drop"):
+        (index,) = args
+        if 0 <= index < len(var.inventory):
+            item = var.inventory[index].item
+            if name == "use":
+                item.use()
+            else:
+                item.drop()
+    # go down or up stairs, if the player is on them
+    elif name == "descend":
+        if var.stairs.x == var.player.x and var.stairs.y == var.player.y:
+            next_level()
+    elif var.upstairs is not None and var.upstairs.x == var.player.x and var.upstairs.y == var.player.y:
+        previous_level()
+    return "didnt-take-turn"
+
+
+def monsters_take_turn() -> None:
+    """Let the awake monsters take the turns they are due while the player acts."""
+    var.flow_field = None  # the player has acted, so the distances are recomputed when first needed
+
+    # monsters in view wake up (in a fixed order, so games replay the same)
+    store = var.game_objects
+    slots = store.seen(var.visible, "ai")
+    for obj in store.objects(slots[np.lexsort((store.x[slots], store.y[slots]))]):
+        var.scheduler.wake(obj)
+    var.scheduler.advance(delay(var.player))
+
+
+def play_turn(action: tuple) -> str | None:
+    """Play a full turn: the player's action, then the monsters' turn and level-ups."""
+    if var.game_state != "playing":
+        return "didnt-take-turn"
+
+    player_action = player_turn(action)
+    with span("fov"):
+        refresh_fov()  # monsters act on what they can see after the player's action
+    if var.game_state == "playing" and player_action != "didnt-take-turn":
+        with span("ai"):
+            monsters_take_turn()
+    check_level_up()
+    if var.recording is not None:
+        var.recording.turn_played(action)
+    if var.autosaver is not None:
+        var.autosaver.turn_played()
+    return player_action
+
+
+def leave_level() -> None:
+    """Put the level the player is on away in the level store, as it is."""
+    objects = [obj for obj in var.game_objects if obj is not var.player]
+    var.levels.put(var.dungeon_level, Level(var.game_map, objects, var.stairs, var.upstairs))
+
+
+def next_level() -> None:
+    """Advance to the next level, which is created the first time the player goes there."""
+    message("You take a moment to rest, and recover your strength.", Colors.LIGHT_VIOLET)
+    var.player.fighter.heal(var.player.fighter.max_hp / 2)  # heal the player by 50%
+
+    leave_level()
+    var.dungeon_level += 1
+    message("After a rare moment of peace, you descend deeper into the heart of the dungeon...", Colors.RED)
+    level = var.levels.take(var.dungeon_level)
+    if level is not None:
+        enter_level(level, level.upstairs.x, level.upstairs.y)
+    else:
+        level = var.pregenerator.take(var.dungeon_level) if var.pregenerator is not None else None
+        if level is not None:
+            enter_level(level, *level.start)
+        else:
+            make_map()  # create a fresh new level!
+    initialize_fov()
+    if var.pregenerator is not None:
+        var.pregenerator.prefetch()
+
+
+def previous_level() -> None:
+    """Go back up to the level above, arriving on its stairs down."""
+    leave_level()
+    var.dungeon_level -= 1
+    message("You climb back up the stairs.", Colors.LIGHT_VIOLET)
+    level = var.levels.take(var.dungeon_level)
+    enter_level(level, level.stairs.x, level.stairs.y)
+    initialize_fov()
+
+
+def new_game(seed: int | None = None) -> None:
+    """Create a new game, with a random seed unless one is given."""
+    # create object representing the player
+    fighter_component = Fighter(hp=100, defense=1, power=2, xp=0, death_function=player_death)
+    var.player = Object(0, 0, const.PLAYER_TILE, "player", Colors.WHITE, blocks=True, fighter=fighter_component)
+
+    var.player.level = 1
+
+    # generate map (at this point it's not drawn to the screen)
+    if var.levels is not None:
+        var.levels.close()
+    var.levels = new_level_store()
+    var.seed = random.getrandbits(32) if seed is None else seed
+    seed_streams(var.seed)
+    var.dungeon_level = 1
+    make_map()
+    initialize_fov()
+
+    var.game_state = "playing"
+    var.inventory = []
+    index_equipment()
+
+    # create the log of game messages and their colors, starts empty
+    var.game_msgs = MessageLog()
+
+    # a warm welcoming message!
+    message("Welcome stranger! Prepare to perish in the Tombs of the Ancient Kings.", Colors.RED)
+
+    # initial equipment: a dagger
+    dagger = template("dagger").spawn(0, 0)
+    var.inventory.append(dagger)
+    dagger.equipment.equip()
@@ -0,0 +1,29 @@
+"""Player interface used by the game logic whenever it needs a decision from the player."""
+
+from typing import Any
+
+from . import variables as var
+
+
+class Interface:
+    """Headless interface: no window, every question gets a default answer."""
+
+    def choose_level_up(self, options: list[str]) -> int | None:
+        """Return the index of the stat to raise on level up, or None to ask again."""
+        return 0
+
+    def target_tile(self, max_range: int | None = None) -> tuple[int | None, int | None]:
+        """Return the position of a tile in the player's FOV (optionally in a range), or (None, None) to cancel."""
+        return (None, None)
+
+    def target_monster(self, max_range: int | None = None) -> Any:
+        """Returns a targeted monster inside FOV up to a range, or None if cancelled."""
+        while True:
+            (x, y) = self.target_tile(max_range)
+            if x is None:  # player cancelled
+                return None
+
+            # return the first targeted monster, otherwise continue looping
+            for obj in var.game_objects.at(x, y):
+                if obj.fighter and obj != var.player:
+                    return obj
@@ -0,0 +1,55 @@
+"""Shared flow field (distance map to the player) used by monsters to path towards the player."""
+
+from typing import Any
+
+import numpy as np
+import tcod
+
+from ..classes.chunked_plane import ChunkedPlane
+from . import constants as const
+from . import variables as var
+
+# step costs: diagonal moves are a bit more expensive, so monsters prefer straight lines
+CARDINAL_COST = 2
+DIAGONAL_COST = 3
+
+# the eight neighbouring tiles, straight ones first
+NEIGHBOURS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1))
+
+
+def compute_distance_to(x: int, y: int, radius: int | None = None) -> Any:
+    """Return the walking distance from every tile to the given one, indexed [x, y] (searching within a radius, if given)."""
+    game_map = var.game_map
+    x1, y1, x2, y2 = 0, 0, game_map.width, game_map.height
+    if radius is not None:
+        x1, y1 = max(x - radius, 0), max(y - radius, 0)
+        x2, y2 = min(x + radius + 1, x2), min(y + radius + 1, y2)
+
+    cost = (~game_map.blocked[x1:x2, y1:y2]).astype(np.int8)
+    distance = tcod.path.maxarray(cost.shape, order="F")
+    distance[x - x1, y - y1] = 0
+    tcod.path.dijkstra2d(distance, cost, CARDINAL_COST, DIAGONAL_COST, out=distance)
+    if radius is None:
+        return distance
+
+    # tiles outside the radius read as unreachable
+    field = ChunkedPlane(game_map.width, game_map.height, distance.dtype, np.iinfo(distance.dtype).max)
+    field[x1:x2, y1:y2] = distance
+    return field
+
+
+def compute_flow_field() -> ChunkedPlane:
+    """Return the walking distance from the tiles around the player to the player, indexed [x, y]."""
+    return compute_distance_to(var.player.x, var.player.y, const.FLOW_FIELD_RADIUS)
+
+
+def flow_field() -> ChunkedPlane:
+    """Return this turn's flow field, computing it the first time a monster needs it."""
+    if var.flow_field is None:
+        var.flow_field = compute_flow_field()
+    return var.flow_field
+
+
+def is_reachable(distance: Any, x: int, y: int) -> bool:
+    """Return True if the tile has a path to the player."""
+    return bool(distance[x, y] != np.iinfo(distance.dtype).max)
@@ -0,0 +1,238 @@
+"""Batch playouts: many seeded headless games played by a bot policy, in parallel, summarized in a report."""
+
+import importlib
+import os
+import random
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from . import constants as const
+from . import content
+from . import variables as var
+from .engine import new_game, play_turn
+from .interface import Interface
+from .pathfinding import NEIGHBOURS, compute_distance_to, is_reachable
+from .spells import closest_monster
+
+PICKUP_CHANCE = 0.05  # share of the random bot's actions that try to pick something up
+USE_CHANCE = 0.03  # share of its actions that use an inventory item
+
+# constants only read when the game is imported (the screen layout, defaults of the message log,
+# the map chunks and the background services), which can't be overridden for a playout. the
+# others are read as the game runs: fields that default to a constant (like an object's speed)
+# read it when the object is created rather than when its class is defined, so they follow too
+FIXED_CONSTANTS = frozenset(
+    {
+        "SCREEN_WIDTH",
+        "SCREEN_HEIGHT",
+        "BAR_WIDTH",
+        "PANEL_HEIGHT",
+        "PANEL_Y",
+        "VIEW_WIDTH",
+        "VIEW_HEIGHT",
+        "MSG_X",
+        "MSG_WIDTH",
+        "MSG_HEIGHT",
+        "MSG_HISTORY",
+        "MSG_WRAP_CACHE",
+        "MAP_CHUNK_SIZE",
+        "PROFILE_WINDOW",
+        "PROFILE_HISTORY",
+        "PREGENERATE_AHEAD",
+        "PREGENERATE_WORKERS",
+        "AUTOSAVE_INTERVAL",
+        "AUTOSAVE_SNAPSHOT_EVERY",
+    }
+)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """How the games of a playout are played."""
+
+    policy: str = "stairs"
+    max_turns: int = 5000  # turns after which a game is stopped
+    overrides: dict[str, Any] = field(default_factory=dict)  # constants to set, by name
+    content_file: str | None = None  # content file to use instead of the game's own
+
+
+class RandomBot(Interface):
+    """Wanders around at random, picking up and using whatever it finds."""
+
+    def __init__(self, seed: int):
+        """Initialize class."""
+        self.random = random.Random(seed)
+
+    def act(self) -> tuple:
+        """Return the next action."""
+        roll = self.random.random()
+        if roll < PICKUP_CHANCE:
+            return ("pickup",)
+        if roll < PICKUP_CHANCE + USE_CHANCE and var.inventory:
+            return ("use", self.random.randrange(len(var.inventory)))
+        if var.stairs.x == var.player.x and var.stairs.y == var.player.y:
+            return ("descend",)
+        return ("move", *self.random.choice(NEIGHBOURS))
+
+    def choose_level_up(self, options: list[str]) -> int | None:
+        """Pick a random stat."""
+        return self.random.randrange(len(options))
+
+    def target_tile(self, max_range: int | None = None) -> tuple[int | None, int | None]:
+        """Aim at the closest monster in view, if any."""
+        monster = closest_monster(max_range if max_range is not None else const.TORCH_RADIUS)
+        return (monster.x, monster.y) if monster is not None else (None, None)
+
+
+class StairsBot(RandomBot):
+    """Heads straight for the stairs, fighting what's in the way and drinking potions when hurt."""
+
+    distance_map: tuple[Any, np.ndarray] | None = None  # (map, distance to its stairs)
+
+    def act(self) -> tuple:
+        """Return the next action."""
+        player = var.player
+        fighter = player.fighter
+
+        if fighter.hp < fighter.max_hp * 0.4:
+            for index, obj in enumerate(var.inventory):
+                if obj.name == "healing potion":
+                    return ("use", index)
+
+        for obj in var.game_objects.at(player.x, player.y):
+            if obj.item and not obj.equipment:
+                return ("pickup",)
+        if var.stairs.x == player.x and var.stairs.y == player.y:
+            return ("descend",)
+
+        # attack an adjacent monster, otherwise walk downhill towards the stairs
+        for dx, dy in NEIGHBOURS:
+            target = var.game_objects.blocking_at(player.x + dx, player.y + dy)
+            if target is not None and target.fighter:
+                return ("move", dx, dy)
+        distance = self.distance_to_stairs()
+        if not is_reachable(distance, player.x, player.y):
+            return super().act()
+        dx, dy = min(NEIGHBOURS, key=lambda step: distance[player.x + step[0], player.y + step[1]])
+        return ("move", dx, dy)
+
+    def distance_to_stairs(self) -> np.ndarray:
+        """Return the walking distance to the stairs, computed once per level (only walls count)."""
+        if self.distance_map is None or self.distance_map[0] is not var.game_map:
+            self.distance_map = (var.game_map, compute_distance_to(var.stairs.x, var.stairs.y))
+        return self.distance_map[1]
+
+
+POLICIES = {"random": RandomBot, "stairs": StairsBot}
+
+
+def load_policy(name: str) -> type:
+    """Return a bot policy class, by its name in POLICIES or as ``"module:Class"``."""
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, cls = name.partition(":")
+    if not cls:
+        raise ValueError(f"Unknown policy {name!r}: use one of {', '.join(POLICIES)} or module:Class")
+    return getattr(importlib.import_module(module), cls)
+
+
+def play_one(seed: int, settings: Settings) -> dict[str, Any]:
+    """Play one headless game with a bot and return its statistics."""
+    bot = load_policy(settings.policy)(seed)
+    saved = var.interface
+    var.interface = bot
+    try:
+        new_game(seed)
+        turns = damage_taken = 0
+        items_used: Counter = Counter()
+        while var.game_state == "playing" and turns < settings.max_turns:
+            action = bot.act()
+            hp = var.player.fighter.hp
+            item = var.inventory[action[1]] if action[0] == "use" else None
+            play_turn(action)
+            turns += 1
+            damage_taken += max(0, hp - var.player.fighter.hp)
+            if item is not None and (item.equipment or item not in var.inventory):
+                items_used[item.name] += 1
+        return {
+            "seed": seed,
+            "outcome": "died" if var.game_state == "dead" else "survived",
+            "depth": var.dungeon_level,
+            "turns": turns,
+            "level": var.player.level,
+            "damage_taken": damage_taken,
+            "items_used": dict(items_used),
+        }
+    finally:
+        var.interface = saved
+        if var.levels is not None:
+            var.levels.close()  # worker processes don't run exit handlers, so the spill directory goes now
+            var.levels = None
+
+
+def check_settings(settings: Settings) -> None:
+    """Raise ValueError for settings that can't take effect: unknown or fixed constants, a missing content file."""
+    load_policy(settings.policy)
+    for name in settings.overrides:
+        if not hasattr(const, name):
+            raise ValueError(f"No constant named {name}")
+        if name in FIXED_CONSTANTS:
+            raise ValueError(f"{name} is only read when the game is imported, it can't be overridden")
+    if settings.content_file is not None and not Path(settings.content_file).is_file():
+        raise ValueError(f"No content file {settings.content_file}")
+
+
+def apply_settings(settings: Settings) -> None:
+    """Set the constants and the content file for the games about to be played (e.g. to try a different balance)."""
+    for name, value in settings.overrides.items():
+        setattr(const, name, value)
+    if settings.content_file is not None:
+        content.CONTENT_FILE = Path(settings.content_file)
+        content.reload()
+
+
+def run_playouts(
+    games: int, settings: Settings | None = None, seed: int = 0, workers: int | None = None
+) -> list[dict[str, Any]]:
+    """Play games with seeds ``seed`` to ``seed + games - 1`` across a process pool, returning their statistics."""
+    settings = settings or Settings()
+    check_settings(settings)  # fail early, not in every worker
+    workers = workers or os.cpu_count() or 1
+    seeds = range(seed, seed + games)
+    with ProcessPoolExecutor(workers, initializer=apply_settings, initargs=(settings,)) as pool:
+        chunksize = max(1, games // (workers * 8))
+        return list(pool.map(play_one, seeds, [settings] * games, chunksize=chunksize))
+
+
+def summarize(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregate playout statistics into a report."""
+
+    def spread(values: list[float]) -> dict[str, float]:
+        """Return the mean, median, 10th and 90th percentiles and maximum of some values."""
+        return {
+            "mean": statistics.fmean(values),
+            "median": statistics.median(values),
+            "p10": float(np.percentile(values, 10)),
+            "p90": float(np.percentile(values, 90)),
+            "max": max(values),
+        }
+
+    items_used: Counter = Counter()
+    for result in results:
+        items_used.update(result["items_used"])
+    return {
+        "games": len(results),
+        "died": sum(result["outcome"] == "died" for result in results),
+        "depth": spread([result["depth"] for result in results]),
+        "depth_reached": dict(sorted(Counter(result["depth"] for result in results).items())),
+        "turns": spread([result["turns"] for result in results]),
+        "damage_taken": spread([result["damage_taken"] for result in results]),
+        "level": spread([result["level"] for result in results]),
+        "items_used_per_game": {name: count / len(results) for name, count in items_used.most_common()},
+    }
@@ -0,0 +1,55 @@
+"""Generating upcoming dungeon levels ahead of time, in a pool of worker processes."""
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from ..classes.level_store import Level
+from . import constants as const
+from . import variables as var
+from .dungeon import generate_level
+from .savefile import decode_level, encode_level
+
+
+class Pregenerator:
+    """Generates the levels below the player in worker processes, before they are needed."""
+
+    def __init__(self, ahead: int = const.PREGENERATE_AHEAD, workers: int = const.PREGENERATE_WORKERS):
+        """Initialize class. Worker processes are started when the first level is requested."""
+        self.ahead = ahead
+        # spawned rather than forked, since the game may be running other threads (autosave)
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.seed: int | None = None
+        self.futures: dict[int, Future] = {}
+
+    def prefetch(self) -> None:
+        """Start generating the levels below the current one that haven't been generated or visited yet."""
+        if self.seed != var.seed:  # a different game: its levels are of no use
+            self.cancel(lambda depth: True)
+            self.seed = var.seed
+        self.cancel(lambda depth: depth <= var.dungeon_level)
+
+        for depth in range(var.dungeon_level + 1, var.dungeon_level + self.ahead + 1):
+            if depth not in self.futures and depth not in var.levels:
+                self.futures[depth] = self.pool.submit(generate_encoded_level, var.seed, depth)
+
+    def take(self, depth: int) -> Level | None:
+        """Return the pregenerated level at the given depth, waiting for it if it's still being generated."""
+        future = self.futures.pop(depth, None)
+        if future is None or self.seed != var.seed:
+            return None
+        return decode_level(future.result())
+
+    def cancel(self, condition) -> None:
+        """Forget the levels whose depth matches a condition."""
+        for depth in [depth for depth in self.futures if condition(depth)]:
+            self.futures.pop(depth).cancel()
+
+    def close(self) -> None:
+        """Stop the worker processes, dropping levels that are still being generated."""
+        self.futures.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def generate_encoded_level(seed: int, depth: int) -> bytes:
+    """Worker process: generate a level and return its encoding."""
+    return encode_level(generate_level(seed, depth))
@@ -0,0 +1,125 @@
+"""Per-frame timing of the game loop's phases, with rolling percentiles and export."""
+
+import csv
+import json
+import time
+from collections import deque
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+
+import numpy as np
+
+from . import constants as const
+from . import variables as var
+
+PERCENTILES = (50, 95, 99)
+
+
+class Profiler:
+    """Collects named timing spans per frame."""
+
+    def __init__(self, window: int = const.PROFILE_WINDOW, history: int = const.PROFILE_HISTORY):
+        """Initialize class."""
+        self.window = window
+        self.frames: deque[dict[str, float]] = deque(maxlen=history)  # span durations (ms) and counts of each finished frame
+        self.current: dict[str, float] = {}
+        self.frame_count = 0
+        self.frame_start = time.perf_counter()
+        self.overlay = False  # show the percentiles in the panel
+        self.waited = 0.0  # seconds spent waiting for input
+        self.waited_cpu = 0.0  # CPU seconds used by the process (all threads) while waiting
+        self.exported: Path | None = None  # where the frames were last exported, shown in the overlay
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the code in a with block, adding it to the current frame's span of that name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] = self.current.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    @contextmanager
+    def wait(self):
+        """Wait for input in a with block, keeping the time out of the frame and adding it to the idle totals."""
+        start, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            waited = time.perf_counter() - start
+            self.waited += waited
+            self.waited_cpu += time.process_time() - start_cpu
+            self.frame_start += waited
+
+    def idle_cpu(self) -> float:
+        """Return the CPU usage while waiting for input so far, in percent of one core."""
+        return 100 * self.waited_cpu / self.waited if self.waited else 0.0
+
+    def count(self, name: str, amount: float) -> None:
+        """Add an amount to the current frame's count of that name."""
+        self.current[name] = self.current.get(name, 0.0) + amount
+
+    def end_frame(self) -> None:
+        """Finish the current frame, recording its spans and its total time."""
+        now = time.perf_counter()
+        self.frame_count += 1
+        self.frames.append({"index": self.frame_count, "frame": (now - self.frame_start) * 1000, **self.current})
+        self.current = {}
+        self.frame_start = now
+
+    def recent(self) -> list[dict[str, float]]:
+        """Return the frames in the rolling window."""
+        return list(self.frames)[-self.window :]
+
+    def percentiles(self, name: str) -> tuple[float, ...]:
+        """Return the PERCENTILES of a span over the recent frames, in milliseconds (0 for frames without it)."""
+        recent = self.recent()
+        if not recent:
+            return (0.0,) * len(PERCENTILES)
+        return tuple(np.percentile([frame.get(name, 0.0) for frame in recent], PERCENTILES).tolist())
+
+    def summary(self) -> list[str]:
+        """Return a header and one entry per span with its recent percentiles, for the overlay."""
+        entries = [f"{'ms':<7}" + "".join(f"{f'p{p}':>6}" for p in PERCENTILES)]
+        for name in span_names(self.recent()):
+            entries.append(f"{name:<7}" + "".join(f"{value:6.1f}" for value in self.percentiles(name)))
+        entries.append(f"idle cpu {self.idle_cpu():.1f}%")
+        if self.exported is not None:
+            entries.append(f"saved {self.exported.name}")
+        return entries
+
+    def export(self, path: str | Path = const.PROFILE_FILE) -> None:
+        """Write the recorded frames to a CSV file, or a JSON lines file if the name ends in ``.jsonl``."""
+        path = Path(path)
+        frames = list(self.frames)
+        if path.suffix == ".jsonl":
+            path.write_text("".join(json.dumps(frame) + "\n" for frame in frames))
+        else:
+            names = ["index", *span_names(frames)]
+            with path.open("w", newline="") as file:
+                writer = csv.DictWriter(file, names, restval=0.0, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(frames)
+        self.exported = path
+
+
+def span_names(frames: list[dict[str, float]]) -> list[str]:
+    """Return the names of all spans in some frames, in the order they first appear."""
+    names: dict[str, None] = {}
+    for frame in frames:
+        names.update(dict.fromkeys(frame))
+    names.pop("index", None)
+    return list(names)
+
+
+def span(name: str) -> AbstractContextManager:
+    """Time a phase of the frame, if a profiler is running."""
+    if var.profiler is None:
+        return nullcontext()
+    return var.profiler.span(name)
+
+
+def count(name: str, amount: float) -> None:
+    """Count something in the current frame, if a profiler is running."""
+    if var.profiler is not None:
+        var.profiler.count(name, amount)
@@ -0,0 +1,32 @@
+"""Registry of game functions that objects refer to, so saves store them by name."""
+
+from collections.abc import Callable
+
+_functions: dict[str, Callable] = {}
+
+
+def register(function: Callable) -> Callable:
+    """Register a function under its own name. Can be used as a decorator."""
+    name = function.__name__
+    if _functions.get(name, function) is not function:
+        raise ValueError(f"A different function is already registered as {name!r}")
+    _functions[name] = function
+    return function
+
+
+def function_name(function: Callable | None) -> str | None:
+    """Return the registered name of a function, or None for no function."""
+    if function is None:
+        return None
+    if _functions.get(function.__name__) is not function:
+        raise ValueError(f"{function!r} is not a registered function")
+    return function.__name__
+
+
+def get_function(name: str | None) -> Callable | None:
+    """Return the function registered under a name, or None for no name."""
+    if name is None:
+        return None
+    if name not in _functions:
+        raise ValueError(f"No function registered as {name!r}")
+    return _functions[name]
@@ -0,0 +1,211 @@
+"""Drawing the map, the objects and the GUI panel to the off-screen consoles, touching only the cells that changed."""
+
+import numpy as np
+from tcod import libtcodpy
+from tcod.console import Console
+
+from . import constants as const
+from . import variables as var
+from .colors import Colors
+from .common import is_in_fov, refresh_fov
+from .profiler import count, span
+
+
+def render_bar(x, y, total_width, name, value, maximum):
+    """Render a bar (HP, experience, etc). first calculate the widt o the bar."""
+    if var.panel is None:
+        return
+
+    bar_width = int(float(value) / maximum * total_width)
+
+    if bar_width > 0:
+        var.panel.draw_rect(x, y, bar_width, 1, 0, Colors.LIGHT_RED, Colors.DARK_RED, libtcodpy.BKGND_SCREEN)
+
+    # finally, some centered text with the values
+    var.panel.print(
+        int(x + total_width / 2),
+        y,
+        f"{name}: {str(value)}/{str(maximum)}",
+        Colors.WHITE,
+        Colors.LIGHT_RED,
+        libtcodpy.BKGND_NONE,
+        libtcodpy.CENTER,
+    )
+
+
+def render_all(mouse_x: int = -1, mouse_y: int = -1) -> None:
+    """Draw the cells of the map view and the panel that changed since the last frame, then show them on the root console."""
+    if var.panel is None or var.CON is None or var.visible is None:
+        return
+
+    # recompute FOV if needed (the player moved or something)
+    with span("fov"):
+        refresh_fov()
+
+    game_map = var.game_map
+    camera = var.camera
+    camera.follow(var.player.x, var.player.y, game_map.width, game_map.height)
+    cache = var.frame_cache
+    cache.start_frame()
+    boxes = []
+
+    # the map view only changes with the camera, the FOV, the map or the objects
+    store = var.game_objects
+    map_key = (
+        camera.x,
+        camera.y,
+        id(var.visible),
+        var.visible.version,
+        id(game_map),
+        game_map.explored.version,
+        game_map.block_sight.version,
+        id(store),
+        store.version,
+    )
+    if cache.stale("map", map_key):
+        with span("tiles"):
+            tiles = render_tiles()
+        with span("objects"):
+            render_objects(tiles)
+        with span("diff"):
+            changed = cache.changes("map", tiles)
+            view = cells(var.CON)
+            view[changed] = tiles[changed]
+            boxes.append((var.CON, bounding_box(changed), 0))
+
+    # and the panel only with the messages, the player's stats and what's under the mouse
+    fighter = var.player.fighter
+    overlay = tuple(var.profiler.summary()) if var.profiler is not None and var.profiler.overlay else None
+    panel_key = (
+        id(var.game_msgs),
+        var.game_msgs.version,
+        fighter.hp,
+        fighter.max_hp,
+        var.dungeon_level,
+        get_names_under_mouse(mouse_x, mouse_y),
+        overlay,
+    )
+    if cache.stale("panel", panel_key):
+        with span("panel"):
+            render_panel(mouse_x, mouse_y)
+            changed = cache.changes("panel", cells(var.panel).copy())
+            boxes.append((var.panel, bounding_box(changed), const.PANEL_Y))
+
+    cache.end_frame()
+    count("cells", cache.cells_touched)
+    if var.root is None:
+        return
+
+    # blit the changed part of "con" and "panel" to the root console
+    with span("blit"):
+        for console, box, top in boxes:
+            if box is not None:
+                x, y, width, height = box
+                libtcodpy.console_blit(console, x, y, width, height, var.root, x, top + y)
+
+
+def render_tiles() -> np.ndarray:
+    """Return the cells of the map view, without the objects, indexed [x, y]."""
+    # only the part of the map in view is drawn, working on masks instead of one tile at a time
+    game_map = var.game_map
+    x1, y1, x2, y2 = var.camera.bounds(game_map.width, game_map.height)
+    visible = var.visible[x1:x2, y1:y2]
+    wall = game_map.block_sight[x1:x2, y1:y2]
+    explored = game_map.explored[x1:x2, y1:y2]
+
+    # the player can see visible tiles in full color, and remembers explored ones in grey;
+    # everything else stays blank, like the view past the edges of a small map
+    frame = np.zeros((var.CON.width, var.CON.height), var.CON.rgb.dtype)
+    frame["ch"] = ord(" ")
+    frame["fg"] = Colors.WHITE
+    tiles = frame[: x2 - x1, : y2 - y1]
+    tiles["ch"] = np.where(explored, np.where(wall, const.WALL_TILE, const.FLOOR_TILE), ord(" "))
+    tiles["fg"] = np.where(visible[..., np.newaxis], Colors.WHITE, Colors.GREY)
+    tiles["bg"] = Colors.BLACK
+    return frame
+
+
+def render_objects(tiles: np.ndarray) -> None:
+    """Draw the objects in view on visible tiles, and the always visible ones on explored tiles, in drawing order."""
+    store = var.game_objects
+    game_map = var.game_map
+    camera = var.camera
+
+    # all objects in drawing order, except the player. we want it to
+    # always appear over all other objects! so it's drawn last.
+    slots = store.drawing_order()
+    player = store.slot(var.player)
+    slots = np.append(slots[slots != player], player)
+
+    xs, ys = store.x[slots] - camera.x, store.y[slots] - camera.y
+    in_view = (xs >= 0) & (xs < tiles.shape[0]) & (ys >= 0) & (ys < tiles.shape[1])
+    slots, xs, ys = slots[in_view], xs[in_view], ys[in_view]
+    shown = var.visible[xs + camera.x, ys + camera.y] | (
+        store.always_visible[slots] & game_map.explored[xs + camera.x, ys + camera.y]
+    )
+    slots, xs, ys = slots[shown], xs[shown], ys[shown]
+
+    # of several objects on a tile, the one drawn last is the one that shows
+    _, last = np.unique((xs * tiles.shape[1] + ys)[::-1], return_index=True)
+    top = len(slots) - 1 - last
+    slots, xs, ys = slots[top], xs[top], ys[top]
+    tiles["ch"][xs, ys] = store.char[slots]
+    tiles["fg"][xs, ys] = store.color[slots]
+
+
+def cells(console: Console) -> np.ndarray:
+    """Return a console's cells indexed [x, y], whatever the console's order."""
+    rgb = console.rgb
+    if rgb.shape == (console.width, console.height) and rgb.flags.f_contiguous:
+        return rgb
+    return rgb.T
+
+
+def bounding_box(changed: np.ndarray) -> tuple[int, int, int, int] | None:
+    """Return the smallest (x, y, width, height) rectangle holding all changed cells of a mask indexed [x, y], if any."""
+    columns = np.flatnonzero(changed.any(axis=1))
+    if not len(columns):
+        return None
+    rows = np.flatnonzero(changed.any(axis=0))
+    return (int(columns[0]), int(rows[0]), int(columns[-1] - columns[0] + 1), int(rows[-1] - rows[0] + 1))
+
+
+def render_panel(mouse_x: int, mouse_y: int) -> None:
+    """Draw the GUI panel: messages (or the profiler overlay), the player's stats and what's under the mouse."""
+    # prepare to render the GUI panel
+    libtcodpy.console_clear(var.panel)
+
+    if var.profiler is not None and var.profiler.overlay:
+        # show the frame timings instead of the messages, in columns
+        for i, entry in enumerate(var.profiler.summary()):
+            column, row = divmod(i, const.MSG_HEIGHT)
+            x = const.MSG_X + column * const.PROFILE_COLUMN_WIDTH
+            if x + const.PROFILE_COLUMN_WIDTH <= const.SCREEN_WIDTH:
+                var.panel.print(x, row + 1, entry, Colors.LIGHT_GREY, Colors.BLACK, libtcodpy.BKGND_NONE, libtcodpy.LEFT)
+    else:
+        # print the game messages, one line at a time
+        y = 1
+        for line, color in var.game_msgs:
+            var.panel.print(int(const.MSG_X), y, line, color, Colors.BLACK, libtcodpy.BKGND_NONE, libtcodpy.LEFT)
+            y += 1
+
+    # show the player's stats
+    render_bar(1, 1, const.BAR_WIDTH, "HP", var.player.fighter.hp, var.player.fighter.max_hp)
+
+    var.panel.print_(1, 3, f"Dungeon level {str(var.dungeon_level)}", libtcodpy.BKGND_NONE, libtcodpy.LEFT)
+
+    # display names of objects under the mouse
+    var.panel.print(
+        1, 0, get_names_under_mouse(mouse_x, mouse_y), Colors.LIGHT_GREY, Colors.BLACK, libtcodpy.BKGND_NONE, libtcodpy.LEFT
+    )
+
+
+def get_names_under_mouse(x: int, y: int) -> str:
+    """Return a string with the names of all objects under the mouse."""
+    # create a list with the names of all objects at the mouse's coordinates
+    x, y = var.camera.to_map(x, y)
+    if x is None or not is_in_fov(x, y):
+        return ""
+    names = [g_object.name for g_object in var.game_objects.at(x, y)]
+    names = ", ".join(names)  # join the names, separated by commas
+    return names.capitalize()
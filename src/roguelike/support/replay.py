@@ -0,0 +1,126 @@
+"""Recording games and replaying them headless, checking the game state after every turn."""
+
+import hashlib
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from . import constants as const
+from . import variables as var
+from .engine import new_game, play_turn
+from .interface import Interface
+from .savefile import object_record, pack_map, write_atomically
+
+VERSION = 1
+
+
+class Recording:
+    """The seed and turns of a game, recorded as it is played."""
+
+    def __init__(self, seed: int, turns: list[list[Any]] | None = None):
+        """Initialize class."""
+        self.seed = seed
+        self.turns = turns if turns is not None else []  # [action, answers, checksum] per turn
+        self.answers: list[Any] = []  # answers given during the turn being played
+
+    def answer_given(self, answer: Any) -> None:
+        """Record an answer given to the interface."""
+        self.answers.append(answer)
+
+    def turn_played(self, action: tuple) -> None:
+        """Record a played turn, with a checksum of the game after it."""
+        self.turns.append([list(action), self.answers, checksum()])
+        self.answers = []
+
+    def save(self, path: str | Path = const.RECORDING_FILE) -> None:
+        """Write the recording to a file."""
+        document = {"version": VERSION, "seed": self.seed, "turns": self.turns}
+        write_atomically(path, json.dumps(document, separators=(",", ":")).encode())
+
+
+def load_recording(path: str | Path = const.RECORDING_FILE) -> Recording:
+    """Read a recording from a file."""
+    document = json.loads(Path(path).read_bytes())
+    if document["version"] > VERSION:
+        raise ValueError(f"Recording version {document['version']} is newer than this game (version {VERSION})")
+    return Recording(document["seed"], document["turns"])
+
+
+class RecordingInterface(Interface):
+    """Passes questions on to another interface, recording the answers while a game is recorded."""
+
+    def __init__(self, interface: Interface):
+        """Initialize class."""
+        self.interface = interface
+
+    def record(self, answer: Any) -> Any:
+        """Record an answer, if the game is being recorded, and return it."""
+        if var.recording is not None:
+            var.recording.answer_given(answer)
+        return answer
+
+    def choose_level_up(self, options: list[str]) -> int | None:
+        """Ask the wrapped interface."""
+        return self.record(self.interface.choose_level_up(options))
+
+    def target_tile(self, max_range: int | None = None) -> tuple[int | None, int | None]:
+        """Ask the wrapped interface."""
+        return self.record(self.interface.target_tile(max_range))
+
+
+class ReplayInterface(Interface):
+    """Gives the recorded answers, in order."""
+
+    def __init__(self):
+        """Initialize class."""
+        self.answers: deque = deque()
+
+    def next_answer(self) -> Any:
+        """Return the next recorded answer of this turn."""
+        if not self.answers:
+            raise ValueError("The recording has no more answers for this turn")
+        return self.answers.popleft()
+
+    def choose_level_up(self, options: list[str]) -> int | None:
+        """Return the recorded choice."""
+        return self.next_answer()
+
+    def target_tile(self, max_range: int | None = None) -> tuple[int | None, int | None]:
+        """Return the recorded target."""
+        return tuple(self.next_answer())
+
+
+def checksum() -> str:
+    """Return a short digest of the game state: the current level, the inventory and the messages on the panel."""
+    state = [
+        var.dungeon_level,
+        var.game_state,
+        [object_record(obj) for obj in var.game_objects],
+        [object_record(obj) for obj in var.inventory],
+        list(var.game_msgs),
+    ]
+    digest = hashlib.blake2b(json.dumps(state, separators=(",", ":")).encode(), digest_size=8)
+    digest.update(pack_map(var.game_map))
+    return digest.hexdigest()
+
+
+def replay(recording: Recording, verify: bool = True) -> int:
+    """Replay a recording headless, as fast as possible, and return the number of turns played.
+
+    Raises:
+        ValueError: if ``verify`` is set and the game state differs from the recording after a turn.
+    """
+    saved = var.interface, var.recording, var.autosaver, var.pregenerator
+    interface = var.interface = ReplayInterface()
+    var.recording = var.autosaver = var.pregenerator = None
+    try:
+        new_game(recording.seed)
+        for turn, (action, answers, expected) in enumerate(recording.turns, start=1):
+            interface.answers = deque(answers)
+            play_turn(tuple(action))
+            if verify and checksum() != expected:
+                raise ValueError(f"Replay diverged from the recording at turn {turn}")
+        return len(recording.turns)
+    finally:
+        var.interface, var.recording, var.autosaver, var.pregenerator = saved
@@ -0,0 +1,31 @@
+"""Seeded random number streams, one per kind of randomness."""
+
+import zlib
+
+import tcod
+from tcod import libtcodpy
+
+from . import variables as var
+
+# streams kept for the whole game; map generation makes a fresh stream for every level instead
+STREAMS = ("ai",)
+
+
+def stream_seed(seed: int, *name: object) -> int:
+    """Return the seed of a named stream (stable across processes, unlike ``hash`` of a string)."""
+    return zlib.crc32(repr((seed, *name)).encode())
+
+
+def new_stream(seed: int, *name: object) -> tcod.random.Random:
+    """Return a new random number generator for a named stream."""
+    return tcod.random.Random(tcod.random.MERSENNE_TWISTER, stream_seed(seed, *name))
+
+
+def seed_streams(seed: int) -> None:
+    """(Re)start all game streams from a seed."""
+    var.rng_streams = {name: new_stream(seed, name) for name in STREAMS}
+
+
+def get_int(stream: str, low: int, high: int) -> int:
+    """Return a random integer between low and high (inclusive) from a game stream."""
+    return libtcodpy.random_get_int(var.rng_streams[stream], low, high)
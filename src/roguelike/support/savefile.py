@@ -0,0 +1,278 @@
+"""Versioned binary save format."""
+
+import json
+import random
+import struct
+import zlib
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..classes.basic_monster import BasicMonster
+from ..classes.confused_monster import ConfusedMonster
+from ..classes.equipment import Equipment
+from ..classes.fighter import Fighter
+from ..classes.game_map import GameMap
+from ..classes.item import Item
+from ..classes.level_store import Level, LevelStore
+from ..classes.message_log import MessageLog
+from ..classes.object import Object
+from ..classes.object_store import ObjectStore
+from . import constants as const
+from . import variables as var
+from .common import index_equipment, initialize_fov
+from .registry import function_name, get_function
+from .rng import seed_streams
+from .scheduler import Scheduler
+
+MAGIC = b"RLSV"
+VERSION = 2  # 2: stored dungeon levels and upward stairs
+HEADER = struct.Struct("<4sH")
+LENGTH = struct.Struct("<I")
+
+# map planes, in the order they are stored
+PLANES = ("blocked", "block_sight", "explored")
+
+# AI components, by the name used in save files
+AI_TYPES = {"basic": BasicMonster, "confused": ConfusedMonster}
+
+
+def pack_map(game_map: GameMap) -> bytes:
+    """Return the map's tile planes packed to one bit per tile."""
+    return b"".join(np.packbits(getattr(game_map, name), axis=None).tobytes() for name in PLANES)
+
+
+def unpack_map(width: int, height: int, data: bytes) -> GameMap:
+    """Rebuild a map from packed tile planes."""
+    game_map = GameMap(width, height)
+    plane_size = (width * height + 7) // 8
+    for i, name in enumerate(PLANES):
+        bits = np.frombuffer(data, dtype=np.uint8, count=plane_size, offset=i * plane_size)
+        getattr(game_map, name)[...] = np.unpackbits(bits, count=width * height).reshape(width, height).astype(bool)
+    return game_map
+
+
+def ai_record(ai: Any) -> dict[str, Any]:
+    """Return the save record of an AI component."""
+    if isinstance(ai, ConfusedMonster):
+        return {"type": "confused", "num_turns": ai.num_turns, "old_ai": ai_record(ai.old_ai)}
+    return {"type": "basic"}
+
+
+def ai_from_record(record: dict[str, Any]) -> Any:
+    """Rebuild an AI component from its save record."""
+    if record["type"] == "confused":
+        return ConfusedMonster(ai_from_record(record["old_ai"]), record["num_turns"])
+    return AI_TYPES[record["type"]]()
+
+
+def object_record(obj: Object) -> dict[str, Any]:
+    """Return the save record of an object and its components."""
+    record: dict[str, Any] = {"x": obj.x, "y": obj.y, "char": obj.char, "name": obj.name, "color": obj.color}
+    if obj.blocks:
+        record["blocks"] = True
+    if obj.always_visible:
+        record["always_visible"] = True
+    if obj.level is not None:
+        record["level"] = obj.level
+    if obj.speed != const.NORMAL_SPEED:
+        record["speed"] = obj.speed
+    if obj.fighter:
+        record["fighter"] = {
+            "hp": obj.fighter.hp,
+            "max_hp": obj.fighter.base_max_hp,
+            "defense": obj.fighter.base_defense,
+            "power": obj.fighter.base_power,
+            "xp": obj.fighter.xp,
+            "death_function": function_name(obj.fighter.death_function),
+        }
+    if obj.ai:
+        record["ai"] = ai_record(obj.ai)
+    if obj.equipment:
+        record["equipment"] = {
+            "slot": obj.equipment.slot,
+            "is_equipped": obj.equipment.is_equipped,
+            "power_bonus": obj.equipment.power_bonus,
+            "defense_bonus": obj.equipment.defense_bonus,
+            "max_hp_bonus": obj.equipment.max_hp_bonus,
+        }
+    elif obj.item:
+        record["item"] = {"use_function": function_name(obj.item.use_function)}
+    return record
+
+
+def object_from_record(record: dict[str, Any]) -> Object:
+    """Rebuild an object and its components from its save record."""
+    fighter = None
+    if "fighter" in record:
+        fields = record["fighter"]
+        fighter = Fighter(
+            hp=fields["max_hp"],
+            defense=fields["defense"],
+            power=fields["power"],
+            xp=fields["xp"],
+            death_function=get_function(fields["death_function"]),
+        )
+        fighter.hp = fields["hp"]
+    item = Item(use_function=get_function(record["item"]["use_function"])) if "item" in record else None
+    equipment = Equipment(**record["equipment"]) if "equipment" in record else None
+    return Object(
+        record["x"],
+        record["y"],
+        record["char"],
+        record["name"],
+        tuple(record["color"]),
+        blocks=record.get("blocks", False),
+        always_visible=record.get("always_visible", False),
+        fighter=fighter,
+        ai=ai_from_record(record["ai"]) if "ai" in record else None,
+        item=item,
+        equipment=equipment,
+        level=record.get("level"),
+        speed=record.get("speed", const.NORMAL_SPEED),
+    )
+
+
+def index_or_none(objects: list[Object], obj: Object | None) -> int | None:
+    """Return the position of an object in a list, or None for no object."""
+    return None if obj is None else objects.index(obj)
+
+
+def encode_level(level: Level) -> bytes:
+    """Return a level the player isn't on, encoded for the level store or a save file."""
+    document = {
+        "map": [level.game_map.width, level.game_map.height],
+        "objects": [object_record(obj) for obj in level.objects],
+        "stairs_index": level.objects.index(level.stairs),
+        "upstairs_index": index_or_none(level.objects, level.upstairs),
+        "start": level.start,
+    }
+    data = json.dumps(document, separators=(",", ":")).encode()
+    return zlib.compress(LENGTH.pack(len(data)) + data + pack_map(level.game_map))
+
+
+def decode_level(data: bytes) -> Level:
+    """Rebuild a level from its encoding."""
+    payload = zlib.decompress(data)
+    (length,) = LENGTH.unpack_from(payload)
+    document = json.loads(payload[LENGTH.size : LENGTH.size + length])
+    objects = [object_from_record(record) for record in document["objects"]]
+    upstairs_index = document["upstairs_index"]
+    return Level(
+        unpack_map(*document["map"], payload[LENGTH.size + length :]),
+        objects,
+        objects[document["stairs_index"]],
+        None if upstairs_index is None else objects[upstairs_index],
+        tuple(document.get("start", (0, 0))),
+    )
+
+
+def new_level_store() -> LevelStore:
+    """Return an empty level store that spills levels in the save format."""
+    return LevelStore(encode_level, decode_level, const.LEVEL_CACHE_SIZE)
+
+
+def snapshot() -> dict[str, Any]:
+    """Return the current game state as plain records, sharing nothing with the live game (other levels as futures)."""
+    return {
+        "seed": var.seed,
+        "dungeon_level": var.dungeon_level,
+        "game_state": var.game_state,
+        "messages": var.game_msgs.records(),
+        "messages_added": var.game_msgs.added,
+        "objects": [object_record(obj) for obj in var.game_objects],
+        "player_index": var.game_objects.index(var.player),
+        "stairs_index": var.game_objects.index(var.stairs),
+        "upstairs_index": index_or_none(var.game_objects, var.upstairs),
+        "inventory": [object_record(obj) for obj in var.inventory],
+        "map": (var.game_map.width, var.game_map.height, pack_map(var.game_map)),
+        "levels": {depth: var.levels.encoded(depth) for depth in var.levels.depths()},
+    }
+
+
+def encode(state: dict[str, Any]) -> bytes:
+    """Return the save file contents for a snapshot."""
+    width, height, planes = state["map"]
+    levels = {depth: data.result() if isinstance(data, Future) else data for depth, data in state["levels"].items()}
+    document = dict(state, map=[width, height], levels=list(levels))
+    data = json.dumps(document, separators=(",", ":")).encode()
+    level_data = b"".join(LENGTH.pack(len(levels[depth])) + levels[depth] for depth in levels)
+    return HEADER.pack(MAGIC, VERSION) + zlib.compress(LENGTH.pack(len(data)) + data + planes + level_data)
+
+
+def decode(data: bytes) -> dict[str, Any]:
+    """Return the snapshot stored in save file contents."""
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a save file")
+    if version > VERSION:
+        raise ValueError(f"Save file version {version} is newer than this game (version {VERSION})")
+
+    payload = zlib.decompress(data[HEADER.size :])
+    (length,) = LENGTH.unpack_from(payload)
+    state = json.loads(payload[LENGTH.size : LENGTH.size + length])
+    offset = LENGTH.size + length
+
+    width, height = state["map"]
+    planes_size = len(PLANES) * ((width * height + 7) // 8)
+    state["map"] = (width, height, payload[offset : offset + planes_size])
+    offset += planes_size
+
+    # version 1 saves only have the current level, and no seed for generating the others
+    state.setdefault("upstairs_index", None)
+    state.setdefault("seed", random.getrandbits(32))
+    levels = {}
+    for depth in state.get("levels", []):
+        (length,) = LENGTH.unpack_from(payload, offset)
+        levels[depth] = payload[offset + LENGTH.size : offset + LENGTH.size + length]
+        offset += LENGTH.size + length
+    state["levels"] = levels
+    return state
+
+
+def restore(state: dict[str, Any]) -> None:
+    """Replace the current game with a snapshot."""
+    width, height, planes = state["map"]
+    var.game_map = unpack_map(width, height, planes)
+    var.game_objects = ObjectStore(object_from_record(record) for record in state["objects"])
+    var.player = var.game_objects[state["player_index"]]
+    var.stairs = var.game_objects[state["stairs_index"]]
+    upstairs_index = state["upstairs_index"]
+    var.upstairs = None if upstairs_index is None else var.game_objects[upstairs_index]
+    var.scheduler = Scheduler()  # turn order isn't saved: monsters wake again when they come into view
+    var.seed = state["seed"]
+    seed_streams(var.seed)  # stream positions aren't saved, so a loaded game starts them over
+    var.dungeon_level = state["dungeon_level"]
+    var.inventory = [object_from_record(record) for record in state["inventory"]]
+    var.game_msgs = MessageLog()
+    var.game_msgs.load(state["messages"], state.get("messages_added"))  # older saves have only the panel lines
+    var.game_state = state["game_state"]
+
+    if var.levels is not None:
+        var.levels.close()
+    var.levels = new_level_store()
+    for depth, data in state["levels"].items():
+        var.levels.put_encoded(depth, data)
+
+    index_equipment()
+    initialize_fov()
+
+
+def write_atomically(path: str | Path, data: bytes) -> None:
+    """Write a file through a temporary one, so a crash never leaves a half-written file behind."""
+    path = Path(path)
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_bytes(data)
+    temporary.replace(path)
+
+
+def save_game(path: str | Path = const.SAVE_FILE) -> None:
+    """Write the game to a save file (possibly overwriting an old one)."""
+    write_atomically(path, encode(snapshot()))
+
+
+def load_game(path: str | Path = const.SAVE_FILE) -> None:
+    """Load the game from a save file."""
+    restore(decode(Path(path).read_bytes()))
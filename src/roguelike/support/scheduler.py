@@ -0,0 +1,63 @@
+"""Energy-based turn scheduler that only runs the actors that are awake."""
+
+import heapq
+import itertools
+from typing import Any
+
+from . import constants as const
+from . import variables as var
+
+
+def delay(obj: Any) -> int:
+    """Return the ticks between two turns of an object, from its speed."""
+    return max(1, const.ACTION_COST // obj.speed)
+
+
+class Scheduler:
+    """Priority queue of awake actors, ordered by the game time of their next turn."""
+
+    def __init__(self):
+        """Initialize class."""
+        self.clock = 0
+        self.queue: list[tuple[int, int, Any]] = []  # (time of next turn, tie-breaker, actor)
+        self.awake: dict[Any, int] = {}  # actor -> time of its next turn; queue entries that don't match are stale
+        self.counter = itertools.count()
+
+    def __len__(self) -> int:
+        """Return the number of awake actors."""
+        return len(self.awake)
+
+    def wake(self, obj: Any) -> None:
+        """Wake an actor up, so it acts in the next monster turn. Does nothing if it's already awake."""
+        if obj.ai is not None and obj not in self.awake:
+            self.schedule(obj, self.clock)
+
+    def schedule(self, obj: Any, time: int) -> None:
+        """Set the time of an actor's next turn."""
+        self.awake[obj] = time
+        heapq.heappush(self.queue, (time, next(self.counter), obj))
+
+    def advance(self, ticks: int) -> None:
+        """Let game time pass, giving every awake actor the turns it's due in that time."""
+        end = self.clock + ticks
+        while self.queue and self.queue[0][0] < end:
+            time, _, obj = heapq.heappop(self.queue)
+            if self.awake.get(obj) != time:
+                continue  # stale entry
+            del self.awake[obj]
+            if obj.ai is None or obj not in var.game_objects:
+                continue  # dead, or gone from the level
+
+            self.clock = time
+            obj.ai.take_turn()
+            if var.game_state != "playing":
+                break
+            if obj.ai is not None and obj.ai.active():
+                self.schedule(obj, time + delay(obj))
+        self.clock = end
+
+
+def wake(obj: Any) -> None:
+    """Wake an actor up, if the current level has a scheduler."""
+    if var.scheduler is not None:
+        var.scheduler.wake(obj)
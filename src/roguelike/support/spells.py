@@ -0,0 +1,84 @@
+"""Spells cast by using items."""
+
+from ..classes.confused_monster import ConfusedMonster
+from . import constants as const
+from . import variables as var
+from .colors import Colors
+from .common import message
+from .registry import register
+
+
+@register
+def cast_heal():
+    """Heal the player."""
+    if var.player.fighter.hp == var.player.fighter.max_hp:
+        message("You are already at full health.", Colors.RED)
+        return "cancelled"
+
+    message("Your wounds start to feel better!", Colors.LIGHT_VIOLET)
+    var.player.fighter.heal(const.HEAL_AMOUNT)
+
+
+@register
+def cast_lightning():
+    """Find closest enemy (inside a maximum range) and damage it."""
+    monster = closest_monster(const.LIGHTNING_RANGE)
+    if monster is None:  # no enemy found within maximum range
+        message("No enemy is close enough to strike.", Colors.RED)
+        return "cancelled"
+
+    # zap it!
+    message(
+        f"A lightning bolt strikes the {monster.name} with a loud thunder! "
+        f"The damage is {str(const.LIGHTNING_DAMAGE)} hit points.",
+        color=Colors.LIGHT_BLUE,
+    )
+    monster.fighter.take_damage(const.LIGHTNING_DAMAGE)
+
+
+@register
+def cast_confuse():
+    """Ask the player for a target to confuse."""
+    message("Left-click an enemy to confuse it, or right-click to cancel.", Colors.LIGHT_CYAN)
+    monster = var.interface.target_monster(const.CONFUSE_RANGE)
+    if monster is None:
+        return "cancelled"
+
+    # replace the monster's AI with a "confused" one; after some turns it will restore the old AI
+    old_ai = monster.ai
+    monster.ai = ConfusedMonster(old_ai)
+    monster.ai.owner = monster  # tell the new component who owns it
+    var.game_objects.touch(monster)
+    message(f"The eyes of the {monster.name} look vacant, as he starts to stumble around!", Colors.LIGHT_GREEN)
+
+
+@register
+def cast_fireball():
+    """Ask the player for a target tile to throw a fireball at."""
+    message("Left-click a target tile for the fireball, or right-click to cancel.", Colors.LIGHT_CYAN)
+    (x, y) = var.interface.target_tile()
+    if x is None:
+        return "cancelled"
+    message(f"The fireball explodes, burning everything within {str(const.FIREBALL_RADIUS)} tiles!", Colors.ORANGE)
+
+    # damage every fighter in range, including the player
+    for obj in var.game_objects.objects(var.game_objects.within(x, y, const.FIREBALL_RADIUS, "fighter")):
+        if obj.fighter:  # not killed by the blast already
+            message(f"The {obj.name} gets burned for {str(const.FIREBALL_DAMAGE)} hit points.", Colors.ORANGE)
+            obj.fighter.take_damage(const.FIREBALL_DAMAGE)
+
+
+def closest_monster(max_range: int):
+    """Find closest enemy, up to a maximum range, and in the player's FOV."""
+    if var.visible is None or var.player is None:
+        return
+    # the fighters in view, other than the player, and their squared distances to the player
+    store = var.game_objects
+    slots = store.seen(var.visible, "fighter")
+    slots = slots[slots != store.slot(var.player)]
+    dist = (store.x[slots] - var.player.x) ** 2 + (store.y[slots] - var.player.y) ** 2
+
+    # the closest one, if it's within (slightly more than) the maximum range
+    if slots.size == 0 or dist.min() >= (max_range + 1) ** 2:
+        return None
+    return store.objects(slots[[dist.argmin()]])[0]
@@ -1,21 +1,48 @@
 """Global variables for the game."""
 
-from tcod import console, map
+from typing import Any
 
+from tcod import console
+
+from ..classes.camera import Camera
+from ..classes.chunked_plane import ChunkedPlane
+from ..classes.frame_cache import FrameCache
+from ..classes.game_map import GameMap
+from ..classes.level_store import LevelStore
+from ..classes.message_log import MessageLog
 from ..classes.object import Object
-from ..classes.tile import Tile
+from ..classes.object_store import ObjectStore
+from . import constants as const
+from .interface import Interface
 
-game_map: list[list[Tile]] = []
-game_objects: list[Object] = []
+game_map: GameMap | None = None
+game_objects: ObjectStore = ObjectStore()
 player: Object | None = None
 stairs: Object | None = None
+upstairs: Object | None = None
+levels: LevelStore | None = None  # the levels the player has left, by dungeon level
 inventory: list[Object] = []
-game_msgs: list[tuple[str, tuple[int, int, int]]] = []
+equipped_slots: dict[str, Any] = {}  # the player's equipped items, by slot
+equipment_bonus: dict[str, int] | None = None  # cached bonus totals of the equipped items
+game_msgs: MessageLog = MessageLog()
 game_state: str | None = None
+interface: Interface = Interface()
+seed: int = 0  # levels are generated from this and their depth
 dungeon_level: int | None = None
 
-fov_map: map.Map | None = None
+autosaver: Any = None  # the running autosave.Autosaver, if any
+pregenerator: Any = None  # the running pregenerate.Pregenerator, if any
+profiler: Any = None  # the running profiler.Profiler, if frames are timed
+recording: Any = None  # the replay.Recording of the game being played, if it's recorded
+rng_streams: dict[str, Any] = {}  # the game's random number streams, by name (see rng)
+
 fov_recompute: bool = True
+visible: ChunkedPlane | None = None  # cached FOV result, indexed [x, y]
+scheduler: Any = None  # the current level's scheduler.Scheduler
+flow_field: ChunkedPlane | None = None  # walking distance to the player, shared by all monsters for one turn
 
-CON: console.Console | None = None
+root: console.Console | None = None  # None when running headless
+CON: console.Console | None = None  # the view of the map
+camera: Camera = Camera(const.VIEW_WIDTH, const.VIEW_HEIGHT)
 panel: console.Console | None = None
+frame_cache: FrameCache = FrameCache()  # what was last drawn to CON and panel
@@ -0,0 +1,12 @@
+"""Object store position index."""
+
+import roguelike as rl
+
+
+def test_insert_keeps_tile_in_drawing_order():
+    """Objects inserted anywhere in the drawing order are listed on their tile in that order."""
+    first, second, third, fourth = (rl.Object(1, 1, "x", name, (0, 0, 0)) for name in ("a", "b", "c", "d"))
+    store = rl.ObjectStore([first, rl.Object(2, 2, "x", "elsewhere", (0, 0, 0)), third])
+    store.insert(2, second)
+    store.insert(-1, fourth)
+    assert store.at(1, 1) == [obj for obj in store if (obj.x, obj.y) == (1, 1)] == [first, second, fourth, third]
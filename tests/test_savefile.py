@@ -0,0 +1,46 @@
+"""Save file round trips."""
+
+import roguelike as rl
+from roguelike.support import variables as var
+
+
+def confuse_a_monster() -> rl.Object:
+    """Start a game and confuse a monster for one more turn, returning it."""
+    rl.engine.new_game(1)
+    monster = next(obj for obj in var.game_objects if obj.ai)
+    monster.ai = rl.ConfusedMonster(monster.ai, num_turns=1)
+    monster.ai.owner = monster
+    return monster
+
+
+def wear_off(monster: rl.Object) -> None:
+    """Let a monster's confusion wear off, then give it a turn with its old AI."""
+    monster.ai.take_turn()
+    monster.ai.take_turn()
+    assert isinstance(monster.ai, rl.BasicMonster)
+    assert monster.ai.owner is monster
+    monster.ai.active()
+    monster.ai.take_turn()
+
+
+def test_confused_monster_survives_save_and_load():
+    """A confused monster gets its old AI back after a save and load."""
+    monster = confuse_a_monster()
+    position = (monster.x, monster.y)
+    rl.savefile.restore(rl.savefile.decode(rl.savefile.encode(rl.savefile.snapshot())))
+    (loaded,) = [obj for obj in var.game_objects.at(*position) if obj.ai]
+    assert isinstance(loaded.ai, rl.ConfusedMonster)
+    wear_off(loaded)
+
+
+def test_confused_monster_survives_level_encoding():
+    """A confused monster gets its old AI back after its level was spilled from the level store."""
+    monster = confuse_a_monster()
+    level = rl.Level(var.game_map, list(var.game_objects), var.stairs, var.upstairs)
+    decoded = rl.savefile.decode_level(rl.savefile.encode_level(level))
+    (loaded,) = [obj for obj in decoded.objects if (obj.x, obj.y) == (monster.x, monster.y) and obj.ai]
+    var.game_objects = rl.ObjectStore(decoded.objects)
+    var.player = next(obj for obj in decoded.objects if obj.name == "player")
+    var.game_map = decoded.game_map
+    rl.common.initialize_fov()
+    wear_off(loaded)